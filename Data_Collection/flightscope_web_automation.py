@@ -25,21 +25,16 @@ def generate_combinations(n):
     h_launches = np.linspace(0, 7, 8)     # e.g., [0, 5, 10]
     h_launch_dirs = ['Left', 'Right']
     
-    # Generate all combinations
-    combinations = []
-    for bs in ball_speeds:
-        for la in launch_angles:
-            for sp in spins:
-                for sa in spin_axes:
-                    for sad in spin_axis_dirs:
-                        for hl in h_launches:
-                            for hld in h_launch_dirs:
-                                combinations.append((bs, la, sp, sa, sad, hl, hld))
-    
-    # Randomly sample n combinations
-    if len(combinations) > n:
-        indices = np.random.choice(len(combinations), n, replace=False)
-        combinations = [combinations[i] for i in indices]
+    # Sample n distinct combinations by flat index into the parameter grid instead of enumerating all of them
+    axes = [ball_speeds, launch_angles, spins, spin_axes, np.array(spin_axis_dirs), h_launches, np.array(h_launch_dirs)]
+    shape = [len(a) for a in axes]
+    total = np.prod(shape)
+    if total > n:
+        indices = np.random.default_rng().choice(total, n, replace=False)
+    else:
+        indices = np.arange(total)
+    picks = np.unravel_index(indices, shape)
+    combinations = list(zip(*(a[i] for a, i in zip(axes, picks))))
     
     return combinations
 
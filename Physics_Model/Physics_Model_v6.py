@@ -1,10 +1,123 @@
+import math
+import os
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from scipy.integrate import odeint
+from numba import njit, prange
+from scipy.integrate import solve_ivp
 from scipy.optimize import minimize
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from itertools import groupby
+from joblib import Parallel, delayed
+
+@njit(cache=True, fastmath=True)
+def _cl_table(sn):
+    """
+    np.interp(sn, *golf_ballstics.sn_Cl) written out for the fixed 5-point table, clamped at the ends.
+    Breakpoints sn = 0, 0.04, 0.1, 0.2, 0.4 with Cl = 0, 0.1, 0.16, 0.23, 0.33; keep in sync with sn_Cl.
+    """
+    if sn <= 0.04:
+        return max(sn, 0.0) * 2.5  # (0.1 - 0) / (0.04 - 0)
+    elif sn <= 0.1:
+        return 0.1 + (sn - 0.04) * 1.0  # (0.16 - 0.1) / (0.1 - 0.04)
+    elif sn <= 0.2:
+        return 0.16 + (sn - 0.1) * 0.7  # (0.23 - 0.16) / (0.2 - 0.1)
+    elif sn <= 0.4:
+        return 0.23 + (sn - 0.2) * 0.5  # (0.33 - 0.23) / (0.4 - 0.2)
+    return 0.33
+
+@njit(cache=True, fastmath=True)
+def _accel(vx, vy, vz, omega, B, sin_a, cos_a, abs_sin_a, sin2_a, windvx, windvy, g, two_pi_r, re_per_u, Re_crit,
+           C_d0, C_d1, C_d2, C_d4, C_l2, C_l4):
+    """Acceleration (m/s^2) of a ball moving at vx, vy, vz with spin omega; shared by _rhs and _run_all."""
+    ux = vx - windvx
+    uy = vy - windvy
+    uz = vz
+    u = math.sqrt(ux * ux + uy * uy + uz * uz)
+    
+    sn = omega * two_pi_r / u
+    Re = re_per_u * u
+    Cd = C_d0 + C_d1 * sn + C_d2 / (1 + Re / Re_crit) + C_d4 * abs_sin_a
+    
+    Cl = _cl_table(sn) * (1 + C_l2 * (Re / Re_crit)) * (1 + C_l4 * sin2_a)
+    
+    ax = -B * u * (Cd * ux - Cl * uy * sin_a)
+    ay = -B * u * (Cd * uy - Cl * (ux * sin_a - uz * cos_a))
+    az = -g - B * u * (Cd * uz - Cl * uy * cos_a)
+    return ax, ay, az
+
+@njit(cache=True, fastmath=True)
+def _rhs(state, t, params):
+    """
+    Compiled ODE right-hand side, equivalent to golf_ballstics.model. params is the float64 array built by
+    initiate_hit (the _accel arguments after omega); one array keeps numba's per-call argument checks short,
+    which matters because the solver calls this from Python on every stage.
+    """
+    dstate = np.empty(7)
+    dstate[0] = state[3]
+    dstate[1] = state[4]
+    dstate[2] = state[5]
+    dstate[3], dstate[4], dstate[5] = _accel(state[3], state[4], state[5], state[6], params[0], params[1], params[2],
+                                             params[3], params[4], params[5], params[6], params[7], params[8],
+                                             params[9], params[10], params[11], params[12], params[13], params[14],
+                                             params[15], params[16])
+    dstate[6] = 0.0  # No spin decay
+    return dstate
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _run_all(velocity, launch_angle, horizontal_launch_angle, spin, spin_angle, windvx, windvy, B, re_per_u,
+             h, steps, g, two_pi_r, Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4):
+    """
+    Fixed-step RK4 for N independent shots across all cores, the state of each kept in scalar registers.
+    Angles in radians, spin in rev/s. Returns an (N, 3) array of landing x, y and apex (m); x = y = 0 for a ball
+    still in the air after steps * h seconds.
+    """
+    n = velocity.shape[0]
+    res = np.zeros((n, 3))
+    for i in prange(n):
+        sin_a = math.sin(spin_angle[i])
+        cos_a = math.cos(spin_angle[i])
+        params = (B[i], sin_a, cos_a, abs(sin_a), sin_a * sin_a, windvx[i], windvy[i], g, two_pi_r, re_per_u[i],
+                  Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4)
+        x, y, z = 0.0, 0.0, 0.0
+        vx = velocity[i] * math.cos(launch_angle[i]) * math.sin(horizontal_launch_angle[i])
+        vy = velocity[i] * math.cos(launch_angle[i]) * math.cos(horizontal_launch_angle[i])
+        vz = velocity[i] * math.sin(launch_angle[i])
+        om = spin[i]  # Constant: no spin decay
+        apex = 0.0
+        for _ in range(steps):
+            a1x, a1y, a1z = _accel(vx, vy, vz, om, *params)
+            v2x, v2y, v2z = vx + 0.5 * h * a1x, vy + 0.5 * h * a1y, vz + 0.5 * h * a1z
+            a2x, a2y, a2z = _accel(v2x, v2y, v2z, om, *params)
+            v3x, v3y, v3z = vx + 0.5 * h * a2x, vy + 0.5 * h * a2y, vz + 0.5 * h * a2z
+            a3x, a3y, a3z = _accel(v3x, v3y, v3z, om, *params)
+            v4x, v4y, v4z = vx + h * a3x, vy + h * a3y, vz + h * a3z
+            a4x, a4y, a4z = _accel(v4x, v4y, v4z, om, *params)
+            nx = x + h / 6 * (vx + 2 * v2x + 2 * v3x + v4x)
+            ny = y + h / 6 * (vy + 2 * v2y + 2 * v3y + v4y)
+            nz = z + h / 6 * (vz + 2 * v2z + 2 * v3z + v4z)
+            vx += h / 6 * (a1x + 2 * a2x + 2 * a3x + a4x)
+            vy += h / 6 * (a1y + 2 * a2y + 2 * a3y + a4y)
+            vz += h / 6 * (a1z + 2 * a2z + 2 * a3z + a4z)
+            apex = max(apex, nz)
+            if nz < 0:
+                frac = z / (z - nz)
+                res[i, 0] = x + frac * (nx - x)
+                res[i, 1] = y + frac * (ny - y)
+                break
+            x, y, z = nx, ny, nz
+        res[i, 2] = apex
+    return res
+
+def _ground_hit(t, state):
+    """solve_ivp event: height of the ball, ending the integration when it comes down through z = 0."""
+    return state[2]
+_ground_hit.terminal = True
+_ground_hit.direction = -1
+
+def _apex(t, state):
+    """solve_ivp event: vertical velocity, recording the top of the flight where it turns negative."""
+    return state[5]
+_apex.direction = -1
 
 class golf_ballstics:
     """
@@ -35,29 +148,36 @@ class golf_ballstics:
         self.g = None
         
         # Initial flight properties
-        self.velocity = []
+        self.velocity = np.zeros(3)  # Vectors are refilled in place by initiate_hit
         self.spin = None
         self.spin_angle = None
-        self.windvelocity = []
+        self.windvelocity = np.zeros(3)
         self.horizontal_launch_angle_deg = None  # Store for curvature scaling
         self.windspeed = None  # Store for wind check
         
         # ODE solver parameters
         self.endtime = 10   # Model ball flight for 10 sec
         self.timesteps = 100  # Initial time steps
+        self.maxtime = 40   # Integration stops at landing; this only bounds balls that never come down
+        self._state0 = np.zeros(7)  # Initial state, refilled in place by simulate
         
         # Simulation results storage
-        self.simres = None
-        self.df_simres = pd.DataFrame(columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
+        self.t = None        # Sample times (s)
+        self.simres = None   # (len(t), 7) array of x, y, z, v_x, v_y, v_z, omega
+        self.landed = False
+        self.apex = None     # Apex height (m) from the solver event
         
         # Aerodynamic coefficient data
-        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]
+        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]  # Compiled into _cl_table
+        self._sn_x = np.array(self.sn_Cl[0], dtype=np.float64)  # Same table as arrays for np.interp in Cl
+        self._sn_y = np.array(self.sn_Cl[1], dtype=np.float64)
+        self._params = None  # Per-shot constants passed to _rhs as one array, set by initiate_hit
 
     def initiate_hit(self, velocity, launch_angle_deg, horizontal_launch_angle_deg, 
                      spin_rpm, spin_angle_deg, windspeed, windheading_deg,  
                      mass=0.0455, radius=0.0213, rho=1.225, g=9.81):
         """
-        Simulates golf ball flight and stores results in self.df_simres.
+        Simulates golf ball flight and stores results in self.t and self.simres.
         """
         self.mass = mass
         self.radius = radius
@@ -66,24 +186,31 @@ class golf_ballstics:
         self.horizontal_launch_angle_deg = horizontal_launch_angle_deg
         self.windspeed = windspeed
         self.spin = spin_rpm / 60  # Convert to rev/s
-        self.spin_angle = spin_angle_deg / 180 * np.pi
+        self.spin_angle = math.radians(spin_angle_deg)
         
-        # Ball velocity vector
-        theta = launch_angle_deg / 180 * np.pi
-        psi = horizontal_launch_angle_deg / 180 * np.pi
-        self.velocity = velocity * np.array([
-            np.cos(theta) * np.sin(psi),  # x
-            np.cos(theta) * np.cos(psi),  # y
-            np.sin(theta)               # z
-        ])
+        # Ball velocity vector (scalar math: these are single angles, not arrays)
+        theta = math.radians(launch_angle_deg)
+        psi = math.radians(horizontal_launch_angle_deg)
+        self.velocity[0] = velocity * math.cos(theta) * math.sin(psi)  # x
+        self.velocity[1] = velocity * math.cos(theta) * math.cos(psi)  # y
+        self.velocity[2] = velocity * math.sin(theta)                  # z
         
         # Wind velocity vector
-        windheading = windheading_deg / 180 * np.pi
-        self.windvelocity = windspeed * np.array([
-            np.sin(windheading),  # x
-            np.cos(windheading),  # y
-            0                     # z
-        ])
+        windheading = math.radians(windheading_deg)
+        self.windvelocity[0] = windspeed * math.sin(windheading)  # x
+        self.windvelocity[1] = windspeed * math.cos(windheading)  # y
+        self.windvelocity[2] = 0                                # z
+        
+        # Everything the RHS needs that is constant over the flight
+        self._B = self.rho * np.pi * self.radius * self.radius / (2 * self.mass)
+        self._sin_a = math.sin(self.spin_angle)
+        self._cos_a = math.cos(self.spin_angle)
+        self._abs_sin_a = abs(self._sin_a)
+        self._sin2_a = self._sin_a * self._sin_a
+        self._params = np.array([self._B, self._sin_a, self._cos_a, self._abs_sin_a, self._sin2_a,
+                                 self.windvelocity[0], self.windvelocity[1], self.g, 2 * np.pi * self.radius,
+                                 self.rho * 2 * self.radius / self.mu, self.Re_crit,
+                                 self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4])
         
         self.simulate()
     
@@ -94,50 +221,28 @@ class golf_ballstics:
         Forces zero curvature for spin_axis=0 and windspeed=0.
         
         Parameters:
-        - check (bool): If True, performs sanity checks and returns an error message
+        - check (bool): If True, also returns an error message ('' if the ball landed)
         - curvature_scale_params (tuple): Parameters (a, b, p) for scaling function
         Parameters last optimized on 6/29/2025 3:06 pm, R^2 = 0.9463
         - *args, **kwargs: Passed to initiate_hit
         """
         a, b, p = curvature_scale_params
-        imax = 3
+        self.initiate_hit(*args, **kwargs)
         err = ''
-        cont = True
-        default_endtime = self.endtime
-        i = 0
         
-        while cont:
-            self.initiate_hit(*args, **kwargs)
-            i += 1
-            err = ''
-            cont = False
-            
-            if self.df_simres['z'].iloc[-1] > 0:
-                err = 'error: ball never lands'
-                self.endtime *= 2
-                cont = True
-            elif check:
-                if len(list(groupby(self.df_simres['z'], lambda x: x >= 0))) - 1 > 1:
-                    err = 'error: ball passes through the ground multiple times'
-            
-            if i >= imax:
-                cont = False
-        
-        self.endtime = default_endtime
+        # The terminal ground event ends the flight at the first impact, so multiple crossings cannot occur
+        if not self.landed:
+            err = 'error: ball never lands'
         
         if err == '':
-            index = np.argmax(self.df_simres['z'] < 0) - 1
-            p1 = (self.df_simres['x'][index], self.df_simres['y'][index], self.df_simres['z'][index])
-            p2 = (self.df_simres['x'][index + 1], self.df_simres['y'][index + 1], self.df_simres['z'][index + 1])
-            t = p1[2] / (p1[2] - p2[2])
-            x = p1[0] + t * (p2[0] - p1[0])
-            y = p1[1] + t * (p2[1] - p1[1])
+            # The last row is the ground impact located by the solver event
+            x, y = self.simres[-1, 0], self.simres[-1, 1]
             
             # Convert to yards for curvature calculation
             y_yd = y * 1.09361
             x_yd = x * 1.09361
-            psi = self.horizontal_launch_angle_deg * np.pi / 180
-            x_straight_yd = y_yd * np.tan(psi)
+            psi = math.radians(self.horizontal_launch_angle_deg)
+            x_straight_yd = y_yd * math.tan(psi)
             curvature_yd = x_yd - x_straight_yd
             
             # Check for zero spin axis and no wind
@@ -175,46 +280,80 @@ class golf_ballstics:
     def Cd(self, v, omega):
         sn = self.effective_spin(v, omega)
         Re = self.reynolds_number(v)
-        cd = self.C_d0 + self.C_d1 * sn + self.C_d2 / (1 + Re / self.Re_crit) + self.C_d4 * abs(np.sin(self.spin_angle))
+        cd = self.C_d0 + self.C_d1 * sn + self.C_d2 / (1 + Re / self.Re_crit) + self.C_d4 * self._abs_sin_a
         return cd
     
     def Cl(self, v, omega):
         sn = self.effective_spin(v, omega)
-        cl = np.interp(x=sn, xp=self.sn_Cl[0], fp=self.sn_Cl[1])
+        cl = np.interp(sn, self._sn_x, self._sn_y)
         Re = self.reynolds_number(v)
-        cl_adjusted = cl * (1 + self.C_l2 * (Re / self.Re_crit)) * (1 + self.C_l4 * np.sin(self.spin_angle)**2)
+        cl_adjusted = cl * (1 + self.C_l2 * (Re / self.Re_crit)) * (1 + self.C_l4 * self._sin2_a)
         return cl_adjusted
     
     def model(self, state, t):
-        x, y, z, vx, vy, vz, omega = state
-        v_ball = np.array([vx, vy, vz])
-        v_rel = v_ball - self.windvelocity
-        u = np.linalg.norm(v_rel)
-        
-        a = self.spin_angle
-        B = self.B()
-        Cl = self.Cl(u, omega)
-        Cd = self.Cd(u, omega)
-        
-        ux, uy, uz = v_rel
-        dvxdt = -B * u * (Cd * ux - Cl * uy * np.sin(a))
-        dvydt = -B * u * (Cd * uy - Cl * (ux * np.sin(a) - uz * np.cos(a)))
-        dvzdt = -self.g - B * u * (Cd * uz - Cl * uy * np.cos(a))
-        domega_dt = 0  # No spin decay
-        
-        return [vx, vy, vz, dvxdt, dvydt, dvzdt, domega_dt]
+        """ODE model (no spin decay); thin wrapper around the compiled _rhs."""
+        return _rhs(state, t, self._params)
     
     def simulate(self):
-        self.df_simres['t'] = np.linspace(0, self.endtime, self.timesteps)
-        v0 = [0, 0, 0, self.velocity[0], self.velocity[1], self.velocity[2], self.spin]
-        self.simres = odeint(self.model, v0, self.df_simres['t'])
-        self.df_simres['x'] = self.simres[:, 0]
-        self.df_simres['y'] = self.simres[:, 1]
-        self.df_simres['z'] = self.simres[:, 2]
-        self.df_simres['v_x'] = self.simres[:, 3]
-        self.df_simres['v_y'] = self.simres[:, 4]
-        self.df_simres['v_z'] = self.simres[:, 5]
-        self.df_simres['omega'] = self.simres[:, 6]
+        """
+        Integrates with DOP853 (explicit 8th-order RK, no Jacobian needed for this non-stiff ODE), sampled every
+        endtime / (timesteps - 1) s and stopped by a terminal event at ground impact, whose state is the last row.
+        A second event locates the apex exactly (self.apex, m) independent of the sampling.
+        """
+        steps = round(self.maxtime / self.endtime * (self.timesteps - 1))
+        t = np.linspace(0, self.maxtime, steps + 1)
+        self._state0[3:6] = self.velocity
+        self._state0[6] = self.spin
+        sol = solve_ivp(lambda t, state: _rhs(state, t, self._params), (0, self.maxtime), self._state0, method='DOP853',
+                        t_eval=t, events=(_ground_hit, _apex), rtol=1e-6, atol=1e-8)
+        self.landed = sol.status == 1
+        self.t, self.simres = sol.t, sol.y.T
+        if self.landed:
+            self.t = np.append(self.t, sol.t_events[0])
+            self.simres = np.vstack([self.simres, sol.y_events[0]])
+        # A ball launched downwards never rises: its apex is the launch height
+        self.apex = sol.y_events[1][0, 2] if len(sol.t_events[1]) else self.simres[:, 2].max()
+    
+    @property
+    def df_simres(self):
+        """The last trajectory as a DataFrame, built on demand for inspection and plotting."""
+        return pd.DataFrame(np.column_stack([self.t, self.simres]),
+                            columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
+    
+    def simulate_parallel(self, velocity, launch_angle_deg, horizontal_launch_angle_deg,
+                          spin_rpm, spin_angle_deg, windspeed, windheading_deg,
+                          mass=0.0455, radius=0.0213, rho=1.225, g=9.81, curvature_scale_params=(-0.0666,0.8673,0.5023)):
+        """
+        get_landingpos for many shots at once: arguments are arrays (or scalars) with the units of initiate_hit.
+        Each shot is integrated with compiled fixed-step RK4 (step endtime / (timesteps - 1)) on its own core,
+        then the same adaptive curvature scaling is applied to the whole batch.
+        Returns the adjusted landing x, y and the apex height, all arrays in meters.
+        """
+        velocity, launch_angle_deg, horizontal_launch_angle_deg, spin_rpm, spin_angle_deg, windspeed, \
+            windheading_deg, rho = np.broadcast_arrays(*[np.asarray(a, dtype=np.float64) for a in (
+                velocity, launch_angle_deg, horizontal_launch_angle_deg, spin_rpm, spin_angle_deg, windspeed,
+                windheading_deg, rho)])
+        spin_angle = spin_angle_deg / 180 * np.pi
+        windheading = windheading_deg / 180 * np.pi
+        B = rho * np.pi * radius**2 / (2 * mass)
+        h = self.endtime / (self.timesteps - 1)
+        steps = round(self.maxtime / h)
+        res = _run_all(np.ascontiguousarray(velocity), launch_angle_deg / 180 * np.pi,
+                       horizontal_launch_angle_deg / 180 * np.pi, spin_rpm / 60, spin_angle,
+                       windspeed * np.sin(windheading), windspeed * np.cos(windheading), B, rho * 2 * radius / self.mu,
+                       h, steps, g, 2 * np.pi * radius, self.Re_crit,
+                       self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4)
+        x, y, apex = res[:, 0], res[:, 1], res[:, 2]
+        
+        # Adaptive curvature scaling, as in get_landingpos
+        a, b, p = curvature_scale_params
+        y_yd = y * 1.09361
+        x_straight_yd = y_yd * np.tan(horizontal_launch_angle_deg * np.pi / 180)
+        curvature_yd = x * 1.09361 - x_straight_yd
+        scale = np.clip(a * (np.abs(curvature_yd) ** p) + b, 0.1, 2.0)
+        straight = (np.abs(spin_angle) < 1e-6) & (np.abs(windspeed) < 1e-6)  # Zero curvature
+        x_adjusted_yd = np.where(straight, x_straight_yd, x_straight_yd + curvature_yd * scale)
+        return x_adjusted_yd / 1.09361, y, apex
 
 def calculate_air_density(T_f, RH, P_psi):
     """
@@ -229,10 +368,48 @@ def calculate_air_density(T_f, RH, P_psi):
     rho = (P_pa / (R_d * T_k)) * (1 - 0.378 * (P_v / P_pa))
     return rho
 
+def read_excel(path):
+    """pd.read_excel with the Rust calamine reader when python-calamine is installed, else the default openpyxl."""
+    try:
+        return pd.read_excel(path, engine='calamine')
+    except ImportError:
+        return pd.read_excel(path)
+
+def read_excel_cached(path):
+    """
+    Read an Excel sheet through a Parquet copy kept next to it (same name, .parquet extension).
+    The copy is rebuilt whenever the Excel file is newer, so edits to the spreadsheet are picked up.
+    Mixed text/number columns are returned as text in both cases; coerce them with pd.to_numeric.
+    """
+    cache_path = os.path.splitext(path)[0] + '.parquet'
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        try:
+            return pd.read_parquet(cache_path)
+        except ImportError:  # No Parquet engine (pyarrow/fastparquet) installed: fall back to the Excel file
+            pass
+    
+    df = read_excel(path)
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].astype(str)
+    try:
+        df.to_parquet(cache_path, index=False)
+    except ImportError:
+        pass
+    return df
+
+def simulate_one(shot):
+    """
+    Exact (solve_ivp) landing x, y and apex (m) for one shot, given as a dict of initiate_hit keyword arguments.
+    Builds its own golf_ballstics, since the model keeps per-shot state, so shots can run in separate processes.
+    """
+    golf_m = golf_ballstics()
+    x, y = golf_m.get_landingpos(**shot)
+    return x, y, golf_m.apex
+
 # Load Excel data
 #file_path = '/Users/jacksonne/Python Projects/AI_Caddie/AI_Caddie/Data_Collection/random_flightscope_data.xlsx'
 file_path = '/Users/jacksonne/Python Projects/AI_Caddie/AI_Caddie/Data_Collection/flightscope_data_reasonable_shots.xlsx'
-df = pd.read_excel(file_path)
+df = read_excel_cached(file_path)
 
 # Convert columns to numeric
 numeric_columns = [
@@ -240,8 +417,7 @@ numeric_columns = [
     'Launch H (deg)', 'Wind Speed (mph)', 'Temperature (F)', 'Humidity (%)', 
     'Air Pressure (psi)', 'Carry (yd)', 'Lateral (yd)', 'Height (ft)', 'Wind Direction (deg)'
 ]
-for col in numeric_columns:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
+df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
 
 # Drop rows with NaN in required columns
 required_columns = [
@@ -252,111 +428,80 @@ required_columns = [
 df = df.dropna(subset=required_columns)
 
 # Function to classify a shot
+SHOT_LABELS = np.array(['Pull Draw', 'Pull', 'Pull Fade', 'Draw', 'Straight', 'Fade', 'Push Draw', 'Push', 'Push Fade'])
+
 def classify_shot(launch_h_deg, spin_axis_deg):
     """
-    Classify shot based on horizontal launch angle and spin axis.
+    Classify shots based on horizontal launch angle and spin axis (scalars or arrays).
+    The signs of the two angles index the 3 x 3 table SHOT_LABELS (row: pull/straight/push, column: draw/none/fade).
     """
-    if launch_h_deg < 0:
-        if spin_axis_deg < 0:
-            return "Pull Draw"
-        elif spin_axis_deg == 0:
-            return "Pull"
-        else:
-            return "Pull Fade"
-    elif launch_h_deg == 0:
-        if spin_axis_deg < 0:
-            return "Draw"
-        elif spin_axis_deg == 0:
-            return "Straight"
-        else:
-            return "Fade"
-    elif launch_h_deg > 0:
-        if spin_axis_deg < 0:
-            return "Push Draw"
-        elif spin_axis_deg == 0:
-            return "Push"
-        elif spin_axis_deg > 0:
-            return "Push Fade"
-    else:
-        return "Unknown"
+    idx = (np.sign(launch_h_deg).astype(int) + 1) * 3 + (np.sign(spin_axis_deg).astype(int) + 1)
+    return SHOT_LABELS[idx]
 
 # Initialize golf model
 golf_m = golf_ballstics()
+exact_solver = False  # True: adaptive DOP853 per shot (slower, exact landing) instead of the compiled RK4 batch
 
-# Process shots with optimized scaling parameters
-df['sim_carry_yd'] = np.nan
-df['sim_lateral_yd'] = np.nan
-df['sim_apex_height_ft'] = np.nan
-df['actual_curvature_ft'] = np.nan
-df['sim_curvature_ft'] = np.nan
-
-for index, row in df.iterrows():
-    ball_speed_mph = row['Ball Speed (mph)']
-    spin_rpm = row['Spin Rate (rpm)']
-    spin_axis_deg = row['Spin Axis (deg)']
-    launch_v_deg = row['Launch V (deg)']
-    launch_h_deg = row['Launch H (deg)']
-    wind_speed_mph = row['Wind Speed (mph)']
-    wind_direction_deg = row['Wind Direction (deg)']
-    T_f = row['Temperature (F)']
-    RH = row['Humidity (%)']
-    P_psi = row['Air Pressure (psi)']
-    
-    velocity_mps = ball_speed_mph * 0.44704
-    windspeed_mps = wind_speed_mph * 0.44704
-    rho = calculate_air_density(T_f, RH, P_psi)
-
-    x_m, y_m = golf_m.get_landingpos(
-        velocity=velocity_mps,
-        launch_angle_deg=launch_v_deg,
-        horizontal_launch_angle_deg=launch_h_deg,
-        spin_rpm=spin_rpm,
-        spin_angle_deg=spin_axis_deg,
-        windspeed=windspeed_mps,
-        windheading_deg=wind_direction_deg,
-        rho=rho
-    )
-    
-    sim_lateral_yd = x_m * 1.09361
-    sim_carry_yd = y_m * 1.09361
-    apex_height_m = max(golf_m.df_simres['z'][golf_m.df_simres['z'] >= 0])
-    sim_apex_height_ft = apex_height_m * 1.09361 * 3
-        
-    # Calculate curvatures
-    x_straight_actual_yd = row['Carry (yd)'] * np.tan(launch_h_deg * np.pi / 180)
-    x_straight_sim_yd = sim_carry_yd * np.tan(launch_h_deg * np.pi / 180)
-    actual_curvature_ft = (row['Lateral (yd)'] - x_straight_actual_yd) * 3
-    sim_curvature_ft = (sim_lateral_yd - x_straight_sim_yd) * 3
-    
-    df.at[index, 'sim_lateral_yd'] = sim_lateral_yd
-    df.at[index, 'sim_carry_yd'] = sim_carry_yd
-    df.at[index, 'sim_apex_height_ft'] = sim_apex_height_ft
-    df.at[index, 'actual_curvature_ft'] = actual_curvature_ft
-    df.at[index, 'sim_curvature_ft'] = sim_curvature_ft
+# Simulate all shots from the column arrays
+input_columns = [
+    'Ball Speed (mph)', 'Launch V (deg)', 'Launch H (deg)', 'Spin Rate (rpm)', 'Spin Axis (deg)',
+    'Wind Speed (mph)', 'Wind Direction (deg)', 'Temperature (F)', 'Humidity (%)', 'Air Pressure (psi)'
+]
+ball_speed, launch_v, launch_h, spin_rate, spin_axis, wind_speed, wind_dir, T_f, RH, P_psi = \
+    df[input_columns].to_numpy(dtype=np.float64).T
+shots = dict(
+    velocity=ball_speed * 0.44704,
+    launch_angle_deg=launch_v,
+    horizontal_launch_angle_deg=launch_h,
+    spin_rpm=spin_rate,
+    spin_angle_deg=spin_axis,
+    windspeed=wind_speed * 0.44704,
+    windheading_deg=wind_dir,
+    rho=calculate_air_density(T_f, RH, P_psi)
+)
+if exact_solver:
+    # One solve_ivp run per shot, spread over worker processes
+    results = Parallel(n_jobs=-1)(delayed(simulate_one)(dict(zip(shots, shot))) for shot in zip(*shots.values()))
+    x_m, y_m, apex_height_m = np.array(results, dtype=np.float64).reshape(-1, 3).T
+else:
+    x_m, y_m, apex_height_m = golf_m.simulate_parallel(**shots)
+sim_carry_yd = y_m * 1.09361
+sim_lateral_yd = x_m * 1.09361
+sim_apex_height_ft = apex_height_m * 1.09361 * 3
 
-# Calculate differences
-df['carry_diff'] = df['sim_carry_yd'] - df['Carry (yd)']
-df['side_diff'] = df['sim_lateral_yd'] - df['Lateral (yd)']
-df['apex_diff'] = df['sim_apex_height_ft'] - df['Height (ft)']
+# Curvatures, differences and percent errors, computed on the column arrays
+carry_yd, lateral_yd, height_ft = df[['Carry (yd)', 'Lateral (yd)', 'Height (ft)']].to_numpy(dtype=np.float64).T
+tan_launch_h = np.tan(launch_h * np.pi / 180)
+carry_diff = sim_carry_yd - carry_yd
+side_diff = sim_lateral_yd - lateral_yd
+with np.errstate(divide='ignore', invalid='ignore'):
+    carry_percent_error = np.where(carry_yd != 0, np.abs(carry_diff) / carry_yd * 100, np.nan)
+    side_percent_error = np.where(lateral_yd != 0, np.abs(side_diff) / lateral_yd * 100, np.nan)
 
-# Calculate percent errors
-df['carry_percent_error'] = np.where(
-    df['Carry (yd)'] != 0,
-    (abs(df['carry_diff']) / df['Carry (yd)']) * 100,
-    np.nan
+# Attach all results (and the shot classification) in one step
+df = df.assign(
+    sim_carry_yd=sim_carry_yd,
+    sim_lateral_yd=sim_lateral_yd,
+    sim_apex_height_ft=sim_apex_height_ft,
+    actual_curvature_ft=(lateral_yd - carry_yd * tan_launch_h) * 3,
+    sim_curvature_ft=(sim_lateral_yd - sim_carry_yd * tan_launch_h) * 3,
+    carry_diff=carry_diff,
+    side_diff=side_diff,
+    apex_diff=sim_apex_height_ft - height_ft,
+    carry_percent_error=carry_percent_error,
+    side_percent_error=side_percent_error,
+    **{'Shot Classification': classify_shot(launch_h, spin_axis)}
 )
-df['side_percent_error'] = np.where(
-    df['Lateral (yd)'] != 0,
-    (abs(df['side_diff']) / df['Lateral (yd)']) * 100,
-    np.nan
-)
-
-# Add Shot Classification
-df['Shot Classification'] = df.apply(lambda row: classify_shot(row['Launch H (deg)'], row['Spin Axis (deg)']), axis=1)
 
 # Define the output file path
 output_path = '/Users/jacksonne/Python Projects/AI_Caddie/AI_Caddie/Data_Collection/random_flightscope_data_classified.xlsx'
 df.to_excel(output_path, index=False)
+try:
+    # Fast copy for later scripts; mixed text/number columns are stored as text
+    df.astype({col: str for col in df.columns[df.dtypes == object]}).to_parquet(
+        os.path.splitext(output_path)[0] + '.parquet', index=False)
+except ImportError:
+    pass
 print(f"\nUpdated DataFrame with shot classifications and curvature saved to {output_path}")
 
 # Create comparison DataFrame
@@ -387,21 +532,26 @@ buttons = []
 for i, shot_type in enumerate(shot_types):
     type_df = df[df['Shot Classification'] == shot_type]
     
+    # Hover text assembled column by column; shared launch conditions are formatted once for both traces
+    fmt0, fmt1 = '{:.0f}'.format, '{:.1f}'.format
+    launch_txt = ('<br>Ball Speed: ' + type_df['Ball Speed (mph)'].astype(str) + ' mph<br>'
+                  'Launch V: ' + type_df['Launch V (deg)'].astype(str) + ' deg<br>')
+    sim_hover = ('Simulated<br>Carry: ' + type_df['sim_carry_yd'].map(fmt0) +
+                 ', Lateral: ' + type_df['sim_lateral_yd'].map(fmt0) + launch_txt +
+                 'Apex: ' + type_df['sim_apex_height_ft'].map(fmt1) + ' ft<br>'
+                 'Curvature: ' + type_df['sim_curvature_ft'].map(fmt1) + ' ft')
+    act_hover = ('Actual<br>Carry: ' + type_df['Carry (yd)'].map(fmt0) +
+                 ', Lateral: ' + type_df['Lateral (yd)'].map(fmt0) + launch_txt +
+                 'Apex: ' + type_df['Height (ft)'].map(fmt1) + ' ft<br>'
+                 'Curvature: ' + type_df['actual_curvature_ft'].map(fmt1) + ' ft')
+    
     sim_trace = go.Scatter(
         x=type_df['sim_lateral_yd'],
         y=type_df['sim_carry_yd'],
         mode='markers',
         name=f'{shot_type} Simulated',
         marker=dict(color='blue', symbol='circle'),
-        hovertext=[
-            f"Simulated<br>"
-            f"Carry: {row['sim_carry_yd']:.0f}, Lateral: {row['sim_lateral_yd']:.0f}<br>"
-            f"Ball Speed: {row['Ball Speed (mph)']} mph<br>"
-            f"Launch V: {row['Launch V (deg)']} deg<br>"
-            f"Apex: {row['sim_apex_height_ft']:.1f} ft<br>"
-            f"Curvature: {row['sim_curvature_ft']:.1f} ft"
-            for _, row in type_df.iterrows()
-        ],
+        hovertext=sim_hover.tolist(),
         hoverinfo='text'
     )
     
@@ -411,23 +561,18 @@ for i, shot_type in enumerate(shot_types):
         mode='markers',
         name=f'{shot_type} Actual',
         marker=dict(color='red', symbol='x'),
-        hovertext=[
-            f"Actual<br>"
-            f"Carry: {row['Carry (yd)']:.0f}, Lateral: {row['Lateral (yd)']:.0f}<br>"
-            f"Ball Speed: {row['Ball Speed (mph)']} mph<br>"
-            f"Launch V: {row['Launch V (deg)']} deg<br>"
-            f"Apex: {row['Height (ft)']:.1f} ft<br>"
-            f"Curvature: {row['actual_curvature_ft']:.1f} ft"
-            for _, row in type_df.iterrows()
-        ],
+        hovertext=act_hover.tolist(),
         hoverinfo='text'
     )
 
-    x_lines = []
-    y_lines = []
-    for _, row in type_df.iterrows():
-        x_lines.extend([row['sim_lateral_yd'], row['Lateral (yd)'], None])
-        y_lines.extend([row['sim_carry_yd'], row['Carry (yd)'], None])
+    # Error lines: (simulated, actual, None gap) per shot, filled by strided slices
+    n = len(type_df)
+    x_lines = np.full(3 * n, None, dtype=object)
+    y_lines = np.full(3 * n, None, dtype=object)
+    x_lines[0::3] = type_df['sim_lateral_yd'].to_numpy()
+    x_lines[1::3] = type_df['Lateral (yd)'].to_numpy()
+    y_lines[0::3] = type_df['sim_carry_yd'].to_numpy()
+    y_lines[1::3] = type_df['Carry (yd)'].to_numpy()
     line_trace = go.Scatter(
         x=x_lines,
         y=y_lines,
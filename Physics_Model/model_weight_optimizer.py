@@ -1,9 +1,292 @@
+import math
 import pandas as pd
 import numpy as np
 from scipy.integrate import odeint
-from scipy.optimize import minimize
+from scipy.optimize import minimize, differential_evolution
+from scipy.stats import qmc
 from itertools import groupby
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+try:
+    from numba import njit, prange, cuda
+    HAVE_NUMBA = True
+except ImportError:  # Kernels below run as plain Python; simulate_parallel switches to _run_all_numpy
+    HAVE_NUMBA = False
+    prange = range
+    cuda = None
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+@njit(cache=True)
+def _cl_table(sn):
+    """
+    np.interp(sn, *golf_ballstics.sn_Cl) written out for the fixed 5-point table, clamped at the ends.
+    Breakpoints sn = 0, 0.04, 0.1, 0.2, 0.4 with Cl = 0, 0.1, 0.16, 0.23, 0.33; keep in sync with sn_Cl.
+    """
+    if sn <= 0.04:
+        return max(sn, 0.0) * 2.5  # (0.1 - 0) / (0.04 - 0)
+    elif sn <= 0.1:
+        return 0.1 + (sn - 0.04) * 1.0  # (0.16 - 0.1) / (0.1 - 0.04)
+    elif sn <= 0.2:
+        return 0.16 + (sn - 0.1) * 0.7  # (0.23 - 0.16) / (0.2 - 0.1)
+    elif sn <= 0.4:
+        return 0.23 + (sn - 0.2) * 0.5  # (0.33 - 0.23) / (0.4 - 0.2)
+    return 0.33
+
+@njit(cache=True, error_model='numpy')
+def _accel(vx, vy, vz, omega, B, sin_a, cos_a, windvx, windvy, g, two_pi_r, re_frac_per_u, cd_base, C_d1, C_d2,
+           C_l2, cl_axis):
+    """
+    Acceleration (m/s^2) of a ball moving at vx, vy, vz with spin omega; shared by _rhs and _run_all.
+    Everything after omega is constant over a flight and built once per shot by _flight_constants.
+    error_model='numpy' drops numba's zero-division check (a branch) on every division; the tiny offset on the
+    speed keeps a ball at rest relative to the air finite instead.
+    """
+    ux = vx - windvx
+    uy = vy - windvy
+    uz = vz
+    u = math.sqrt(ux * ux + uy * uy + uz * uz)
+    
+    sn = omega * two_pi_r / (u + 1e-30)
+    re_frac = re_frac_per_u * u  # Re / Re_crit
+    Cd = cd_base + C_d1 * sn + C_d2 / (1 + re_frac)
+    Cl = _cl_table(sn) * (1 + C_l2 * re_frac) * cl_axis
+    
+    Bu = B * u
+    ax = -Bu * (Cd * ux - Cl * uy * sin_a)
+    ay = -Bu * (Cd * uy - Cl * (ux * sin_a - uz * cos_a))
+    az = -g - Bu * (Cd * uz - Cl * uy * cos_a)
+    return ax, ay, az
+
+@njit(cache=True)
+def _flight_constants(B, spin_angle, windvx, windvy, g, two_pi_r, re_per_u, Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2,
+                      C_l4):
+    """The _accel arguments after omega for one shot; spin_angle in radians, re_per_u = rho * 2r / mu."""
+    sin_a = math.sin(spin_angle)
+    return (B, sin_a, math.cos(spin_angle), windvx, windvy, g, two_pi_r, re_per_u / Re_crit,
+            C_d0 + C_d4 * abs(sin_a), C_d1, C_d2, C_l2, 1 + C_l4 * sin_a * sin_a)
+
+@njit(cache=True, error_model='numpy')
+def _rhs(state, t, params):
+    """
+    Compiled ODE right-hand side, equivalent to golf_ballstics.model. params is the float64 array of
+    _flight_constants built by initiate_hit.
+    """
+    dstate = np.empty(7)
+    dstate[0] = state[3]
+    dstate[1] = state[4]
+    dstate[2] = state[5]
+    dstate[3], dstate[4], dstate[5] = _accel(state[3], state[4], state[5], state[6], params[0], params[1], params[2],
+                                             params[3], params[4], params[5], params[6], params[7], params[8],
+                                             params[9], params[10], params[11], params[12])
+    dstate[6] = 0.0  # No spin decay
+    return dstate
+
+@njit(cache=True)
+def _hermite(s, h, p0, p1, d0, d1):
+    """Cubic Hermite interpolant at fraction s of a step of length h, from end values p0, p1 and slopes d0, d1."""
+    s2 = s * s
+    s3 = s2 * s
+    return (2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * h * d0 + (3 * s2 - 2 * s3) * p1 + (s3 - s2) * h * d1
+
+@njit(cache=True, error_model='numpy')
+def _hermite_root(h, z0, z1, vz0, vz1):
+    """Fraction of the step where the Hermite height curve crosses zero: Newton from the linear estimate."""
+    s = z0 / (z0 - z1)
+    for _ in range(3):
+        s2 = s * s
+        f = (2 * s2 * s - 3 * s2 + 1) * z0 + (s2 * s - 2 * s2 + s) * h * vz0 + (3 * s2 - 2 * s2 * s) * z1 \
+            + (s2 * s - s2) * h * vz1
+        df = (6 * s2 - 6 * s) * (z0 - z1) + (3 * s2 - 4 * s + 1) * h * vz0 + (3 * s2 - 2 * s) * h * vz1
+        s -= f / df
+    return s
+
+@njit(parallel=True, cache=True, error_model='numpy')
+def _run_all(velocity, launch_angle, horizontal_launch_angle, spin, spin_angle, windvx, windvy, B, re_per_u,
+             h, steps, g, two_pi_r, Re_crit, coeffs):
+    """
+    Fixed-step RK4 for N independent shots across all cores, the state of each kept in scalar registers.
+    Landing and apex are interpolated with cubic Hermite polynomials (positions and velocities at both ends of
+    the step), so they stay accurate at steps of 0.2 s. Angles in radians, spin in rev/s; coeffs is (N, 6),
+    C_d0, C_d1, C_d2, C_d4, C_l2, C_l4 for each shot. Returns an (N, 3) array of landing x, y and apex (m);
+    x = y = 0 for a ball still in the air after steps * h seconds.
+    """
+    n = velocity.shape[0]
+    res = np.zeros((n, 3))
+    for i in prange(n):
+        params = _flight_constants(B[i], spin_angle[i], windvx[i], windvy[i], g, two_pi_r, re_per_u[i], Re_crit,
+                                   coeffs[i, 0], coeffs[i, 1], coeffs[i, 2], coeffs[i, 3], coeffs[i, 4], coeffs[i, 5])
+        x, y, z = 0.0, 0.0, 0.0
+        vx = velocity[i] * math.cos(launch_angle[i]) * math.sin(horizontal_launch_angle[i])
+        vy = velocity[i] * math.cos(launch_angle[i]) * math.cos(horizontal_launch_angle[i])
+        vz = velocity[i] * math.sin(launch_angle[i])
+        om = spin[i]  # Constant: no spin decay
+        apex = 0.0
+        for _ in range(steps):
+            a1x, a1y, a1z = _accel(vx, vy, vz, om, *params)
+            v2x, v2y, v2z = vx + 0.5 * h * a1x, vy + 0.5 * h * a1y, vz + 0.5 * h * a1z
+            a2x, a2y, a2z = _accel(v2x, v2y, v2z, om, *params)
+            v3x, v3y, v3z = vx + 0.5 * h * a2x, vy + 0.5 * h * a2y, vz + 0.5 * h * a2z
+            a3x, a3y, a3z = _accel(v3x, v3y, v3z, om, *params)
+            v4x, v4y, v4z = vx + h * a3x, vy + h * a3y, vz + h * a3z
+            a4x, a4y, a4z = _accel(v4x, v4y, v4z, om, *params)
+            nx = x + h / 6 * (vx + 2 * v2x + 2 * v3x + v4x)
+            ny = y + h / 6 * (vy + 2 * v2y + 2 * v3y + v4y)
+            nz = z + h / 6 * (vz + 2 * v2z + 2 * v3z + v4z)
+            nvx = vx + h / 6 * (a1x + 2 * a2x + 2 * a3x + a4x)
+            nvy = vy + h / 6 * (a1y + 2 * a2y + 2 * a3y + a4y)
+            nvz = vz + h / 6 * (a1z + 2 * a2z + 2 * a3z + a4z)
+            # Apex and landing fall between steps: locate them on the cubic through both ends of the step.
+            # The height only peaks where vz turns negative, so there is no running maximum to keep.
+            if vz >= 0 and nvz < 0:
+                apex = max(_hermite(vz / (vz - nvz), h, z, nz, vz, nvz), z, nz)
+            if nz < 0:
+                frac = _hermite_root(h, z, nz, vz, nvz)
+                res[i, 0] = _hermite(frac, h, x, nx, vx, nvx)
+                res[i, 1] = _hermite(frac, h, y, ny, vy, nvy)
+                break
+            x, y, z, vx, vy, vz = nx, ny, nz, nvx, nvy, nvz
+        res[i, 2] = apex
+    return res
+
+def _run_all_numpy(velocity, launch_angle, horizontal_launch_angle, spin, spin_angle, windvx, windvy, B, re_per_u,
+                   h, steps, g, two_pi_r, Re_crit, coeffs):
+    """
+    _run_all without numba: the same RK4, with all shots advanced together as NumPy vectors (one array per state
+    component) so each step is a handful of array operations instead of N Python loops. Landed shots keep being
+    stepped, but the alive mask freezes their results; the loop ends once every ball is down.
+    """
+    C_d0, C_d1, C_d2, C_d4, C_l2, C_l4 = coeffs.T
+    sin_a = np.sin(spin_angle)
+    cos_a = np.cos(spin_angle)
+    cd_base = C_d0 + C_d4 * np.abs(sin_a)
+    cl_axis = 1 + C_l4 * sin_a * sin_a
+    re_frac_per_u = re_per_u / Re_crit
+    
+    def accel(vx, vy, vz):
+        ux = vx - windvx
+        uy = vy - windvy
+        u = np.sqrt(ux * ux + uy * uy + vz * vz)
+        sn = spin * two_pi_r / (u + 1e-30)
+        re_frac = re_frac_per_u * u
+        Cd = cd_base + C_d1 * sn + C_d2 / (1 + re_frac)
+        Cl = np.interp(sn, (0, 0.04, 0.1, 0.2, 0.4), (0, 0.1, 0.16, 0.23, 0.33)) * (1 + C_l2 * re_frac) * cl_axis
+        Bu = B * u
+        return (-Bu * (Cd * ux - Cl * uy * sin_a),
+                -Bu * (Cd * uy - Cl * (ux * sin_a - vz * cos_a)),
+                -g - Bu * (Cd * vz - Cl * uy * cos_a))
+    
+    n = velocity.shape[0]
+    res = np.zeros((n, 3))
+    x, y, z = np.zeros(n), np.zeros(n), np.zeros(n)
+    vx = velocity * np.cos(launch_angle) * np.sin(horizontal_launch_angle)
+    vy = velocity * np.cos(launch_angle) * np.cos(horizontal_launch_angle)
+    vz = velocity * np.sin(launch_angle)
+    apex = np.zeros(n)
+    alive = np.ones(n, dtype=bool)
+    for _ in range(steps):
+        a1x, a1y, a1z = accel(vx, vy, vz)
+        v2x, v2y, v2z = vx + 0.5 * h * a1x, vy + 0.5 * h * a1y, vz + 0.5 * h * a1z
+        a2x, a2y, a2z = accel(v2x, v2y, v2z)
+        v3x, v3y, v3z = vx + 0.5 * h * a2x, vy + 0.5 * h * a2y, vz + 0.5 * h * a2z
+        a3x, a3y, a3z = accel(v3x, v3y, v3z)
+        v4x, v4y, v4z = vx + h * a3x, vy + h * a3y, vz + h * a3z
+        a4x, a4y, a4z = accel(v4x, v4y, v4z)
+        nx = x + h / 6 * (vx + 2 * v2x + 2 * v3x + v4x)
+        ny = y + h / 6 * (vy + 2 * v2y + 2 * v3y + v4y)
+        nz = z + h / 6 * (vz + 2 * v2z + 2 * v3z + v4z)
+        nvx = vx + h / 6 * (a1x + 2 * a2x + 2 * a3x + a4x)
+        nvy = vy + h / 6 * (a1y + 2 * a2y + 2 * a3y + a4y)
+        nvz = vz + h / 6 * (a1z + 2 * a2z + 2 * a3z + a4z)
+        top = alive & (vz >= 0) & (nvz < 0)
+        if top.any():
+            apex[top] = np.maximum(_hermite(vz[top] / (vz[top] - nvz[top]), h, z[top], nz[top], vz[top], nvz[top]),
+                                   np.maximum(z[top], nz[top]))
+        landed = alive & (nz < 0)
+        frac = _hermite_root(h, z[landed], nz[landed], vz[landed], nvz[landed])
+        res[landed, 0] = _hermite(frac, h, x[landed], nx[landed], vx[landed], nvx[landed])
+        res[landed, 1] = _hermite(frac, h, y[landed], ny[landed], vy[landed], nvy[landed])
+        alive &= ~landed
+        if not alive.any():
+            break
+        x, y, z, vx, vy, vz = nx, ny, nz, nvx, nvy, nvz
+    res[:, 2] = apex
+    return res
+
+if HAVE_NUMBA:
+    # GPU copies of the batch kernel. The arithmetic-only helpers are compiled from the same Python source.
+    _cl_table_dev = cuda.jit(device=True)(_cl_table.py_func)
+    _hermite_dev = cuda.jit(device=True)(_hermite.py_func)
+    _hermite_root_dev = cuda.jit(device=True)(_hermite_root.py_func)
+    
+    @cuda.jit(device=True)
+    def _accel_dev(vx, vy, vz, omega, B, sin_a, cos_a, windvx, windvy, g, two_pi_r, re_frac_per_u, cd_base, C_d1,
+                   C_d2, C_l2, cl_axis):
+        """Device version of _accel."""
+        ux = vx - windvx
+        uy = vy - windvy
+        uz = vz
+        u = math.sqrt(ux * ux + uy * uy + uz * uz)
+        sn = omega * two_pi_r / (u + 1e-30)
+        re_frac = re_frac_per_u * u
+        Cd = cd_base + C_d1 * sn + C_d2 / (1 + re_frac)
+        Cl = _cl_table_dev(sn) * (1 + C_l2 * re_frac) * cl_axis
+        Bu = B * u
+        ax = -Bu * (Cd * ux - Cl * uy * sin_a)
+        ay = -Bu * (Cd * uy - Cl * (ux * sin_a - uz * cos_a))
+        az = -g - Bu * (Cd * uz - Cl * uy * cos_a)
+        return ax, ay, az
+    
+    @cuda.jit
+    def _run_all_cuda(velocity, launch_angle, horizontal_launch_angle, spin, spin_angle, windvx, windvy, B,
+                      re_per_u, h, steps, g, two_pi_r, Re_crit, coeffs, res):
+        """_run_all with one CUDA thread per shot, writing into the device array res."""
+        i = cuda.grid(1)
+        if i >= velocity.shape[0]:
+            return
+        C_d0, C_d1, C_d2, C_d4, C_l2, C_l4 = coeffs[i, 0], coeffs[i, 1], coeffs[i, 2], coeffs[i, 3], coeffs[i, 4], \
+            coeffs[i, 5]
+        sin_a = math.sin(spin_angle[i])
+        cos_a = math.cos(spin_angle[i])
+        b, wx, wy = B[i], windvx[i], windvy[i]
+        re_frac_per_u = re_per_u[i] / Re_crit
+        cd_base = C_d0 + C_d4 * abs(sin_a)
+        cl_axis = 1 + C_l4 * sin_a * sin_a
+        x, y, z = 0.0, 0.0, 0.0
+        vx = velocity[i] * math.cos(launch_angle[i]) * math.sin(horizontal_launch_angle[i])
+        vy = velocity[i] * math.cos(launch_angle[i]) * math.cos(horizontal_launch_angle[i])
+        vz = velocity[i] * math.sin(launch_angle[i])
+        om = spin[i]
+        apex = 0.0
+        land_x, land_y = 0.0, 0.0
+        for _ in range(steps):
+            a1x, a1y, a1z = _accel_dev(vx, vy, vz, om, b, sin_a, cos_a, wx, wy, g, two_pi_r, re_frac_per_u, cd_base,
+                                       C_d1, C_d2, C_l2, cl_axis)
+            v2x, v2y, v2z = vx + 0.5 * h * a1x, vy + 0.5 * h * a1y, vz + 0.5 * h * a1z
+            a2x, a2y, a2z = _accel_dev(v2x, v2y, v2z, om, b, sin_a, cos_a, wx, wy, g, two_pi_r, re_frac_per_u,
+                                       cd_base, C_d1, C_d2, C_l2, cl_axis)
+            v3x, v3y, v3z = vx + 0.5 * h * a2x, vy + 0.5 * h * a2y, vz + 0.5 * h * a2z
+            a3x, a3y, a3z = _accel_dev(v3x, v3y, v3z, om, b, sin_a, cos_a, wx, wy, g, two_pi_r, re_frac_per_u,
+                                       cd_base, C_d1, C_d2, C_l2, cl_axis)
+            v4x, v4y, v4z = vx + h * a3x, vy + h * a3y, vz + h * a3z
+            a4x, a4y, a4z = _accel_dev(v4x, v4y, v4z, om, b, sin_a, cos_a, wx, wy, g, two_pi_r, re_frac_per_u,
+                                       cd_base, C_d1, C_d2, C_l2, cl_axis)
+            nx = x + h / 6 * (vx + 2 * v2x + 2 * v3x + v4x)
+            ny = y + h / 6 * (vy + 2 * v2y + 2 * v3y + v4y)
+            nz = z + h / 6 * (vz + 2 * v2z + 2 * v3z + v4z)
+            nvx = vx + h / 6 * (a1x + 2 * a2x + 2 * a3x + a4x)
+            nvy = vy + h / 6 * (a1y + 2 * a2y + 2 * a3y + a4y)
+            nvz = vz + h / 6 * (a1z + 2 * a2z + 2 * a3z + a4z)
+            if vz >= 0 and nvz < 0:
+                apex = max(_hermite_dev(vz / (vz - nvz), h, z, nz, vz, nvz), z, nz)
+            if nz < 0:
+                frac = _hermite_root_dev(h, z, nz, vz, nvz)
+                land_x = _hermite_dev(frac, h, x, nx, vx, nvx)
+                land_y = _hermite_dev(frac, h, y, ny, vy, nvy)
+                break
+            x, y, z, vx, vy, vz = nx, ny, nz, nvx, nvy, nvz
+        res[i, 0] = land_x
+        res[i, 1] = land_y
+        res[i, 2] = apex
 
 class golf_ballstics:
     """
@@ -41,13 +324,17 @@ class golf_ballstics:
         # ODE solver parameters
         self.endtime = 10  # Model ball flight for 10 sec
         self.timesteps = 100  # Initial time steps
+        self.maxtime = 40  # get_landingpos retries up to 4x endtime; simulate_parallel integrates this long at most
+        self.batch_dt = 0.2  # RK4 step (s) of simulate_parallel
+        self.use_cuda = HAVE_NUMBA and cuda.is_available()  # run_batch on the GPU, one thread per shot
         
         # Simulation results storage
         self.simres = None
         self.df_simres = pd.DataFrame(columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
         
         # Aerodynamic coefficient data
-        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]
+        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]  # Compiled into _cl_table
+        self._params = None  # Per-shot constants passed to _rhs as one array, set by initiate_hit
 
     def initiate_hit(self, velocity, launch_angle_deg, horizontal_launch_angle_deg, 
                      spin_rpm, spin_angle_deg, windspeed, windheading_deg,  
@@ -71,25 +358,32 @@ class golf_ballstics:
         self.g = g
         
         self.spin = spin_rpm / 60  # Convert to rev/s
-        self.spin_angle = spin_angle_deg / 180 * np.pi
+        self.spin_angle = math.radians(spin_angle_deg)
         
         # Ball velocity vector
-        theta = launch_angle_deg / 180 * np.pi
-        psi = horizontal_launch_angle_deg / 180 * np.pi
+        theta = math.radians(launch_angle_deg)
+        psi = math.radians(horizontal_launch_angle_deg)
         self.velocity = velocity * np.array([
-            np.cos(theta) * np.sin(psi),  # x
-            np.cos(theta) * np.cos(psi),  # y
-            np.sin(theta)               # z
+            math.cos(theta) * math.sin(psi),  # x
+            math.cos(theta) * math.cos(psi),  # y
+            math.sin(theta)               # z
         ])
         
         # Wind velocity vector
-        windheading = windheading_deg / 180 * np.pi
+        windheading = math.radians(windheading_deg)
         self.windvelocity = windspeed * np.array([
-            np.sin(windheading),  # x
-            np.cos(windheading),  # y
+            math.sin(windheading),  # x
+            math.cos(windheading),  # y
             0                     # z
         ])
         
+        # Everything the RHS needs that is constant over the flight; the coefficients are read here, on every
+        # hit, so values set by the optimizer take effect
+        self._params = np.array(_flight_constants(self.B(), self.spin_angle, self.windvelocity[0],
+                                                  self.windvelocity[1], self.g, 2 * math.pi * self.radius,
+                                                  self.rho * 2 * self.radius / self.mu, self.Re_crit,
+                                                  self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4))
+        
         self.simulate()
     
     def get_landingpos(self, check=False, *args, **kwargs):
@@ -145,11 +439,11 @@ class golf_ballstics:
         return x, y
     
     def B(self):
-        area = np.pi * self.radius**2
+        area = math.pi * self.radius**2
         return self.rho * area / (2 * self.mass)
     
     def effective_spin(self, v, omega):
-        sn = omega * 2 * np.pi * self.radius / v
+        sn = omega * 2 * math.pi * self.radius / v
         return sn
     
     def reynolds_number(self, v):
@@ -173,30 +467,14 @@ class golf_ballstics:
         return cl_adjusted
     
     def model(self, state, t):
-        """ODE model with no spin decay."""
-        x, y, z, vx, vy, vz, omega = state
-        v_ball = np.array([vx, vy, vz])
-        v_rel = v_ball - self.windvelocity
-        u = np.linalg.norm(v_rel)
-        
-        a = self.spin_angle
-        B = self.B()
-        Cl = self.Cl(u, omega)
-        Cd = self.Cd(u, omega)
-        
-        ux, uy, uz = v_rel
-        dvxdt = -B * u * (Cd * ux - Cl * uy * np.sin(a))
-        dvydt = -B * u * (Cd * uy - Cl * (ux * np.sin(a) - uz * np.cos(a)))
-        dvzdt = -self.g - B * u * (Cd * uz - Cl * uy * np.cos(a))
-        domega_dt = 0  # No spin decay
-        
-        return [vx, vy, vz, dvxdt, dvydt, dvzdt, domega_dt]
+        """ODE model with no spin decay; thin wrapper around the compiled _rhs."""
+        return _rhs(state, t, self._params)
     
     def simulate(self):
         """Simulate ball flight with spin as a state variable."""
         self.df_simres['t'] = np.linspace(0, self.endtime, self.timesteps)
         v0 = [0, 0, 0, self.velocity[0], self.velocity[1], self.velocity[2], self.spin]
-        self.simres = odeint(self.model, v0, self.df_simres['t'])
+        self.simres = odeint(_rhs, v0, self.df_simres['t'], args=(self._params,))
         self.df_simres['x'] = self.simres[:, 0]
         self.df_simres['y'] = self.simres[:, 1]
         self.df_simres['z'] = self.simres[:, 2]
@@ -205,99 +483,177 @@ class golf_ballstics:
         self.df_simres['v_z'] = self.simres[:, 5]
         self.df_simres['omega'] = self.simres[:, 6]
 
-    def optimize_coefficients(self, df, maxiter=100):
+    def batch_inputs(self, velocity, launch_angle_deg, horizontal_launch_angle_deg,
+                     spin_rpm, spin_angle_deg, windspeed, windheading_deg,
+                     mass=0.0455, radius=0.0213, rho=1.225, g=9.81):
+        """
+        Arguments of the batch kernel for many shots, given as arrays (or scalars) with the units of initiate_hit.
+        None of them depend on the aerodynamic coefficients, so a fit builds them once and passes them to
+        run_batch on every evaluation.
+        """
+        velocity, launch_angle_deg, horizontal_launch_angle_deg, spin_rpm, spin_angle_deg, windspeed, \
+            windheading_deg, rho = np.broadcast_arrays(*[np.asarray(a, dtype=np.float64) for a in (
+                velocity, launch_angle_deg, horizontal_launch_angle_deg, spin_rpm, spin_angle_deg, windspeed,
+                windheading_deg, rho)])
+        windheading = windheading_deg / 180 * np.pi
+        h = self.batch_dt
+        return (np.ascontiguousarray(velocity), launch_angle_deg / 180 * np.pi,
+                horizontal_launch_angle_deg / 180 * np.pi, spin_rpm / 60, spin_angle_deg / 180 * np.pi,
+                windspeed * np.sin(windheading), windspeed * np.cos(windheading),
+                rho * np.pi * radius**2 / (2 * mass), rho * 2 * radius / self.mu,
+                h, round(self.maxtime / h), g, 2 * np.pi * radius, self.Re_crit)
+    
+    def run_batch(self, inputs, coeffs=None, threads_per_block=128):
+        """
+        Integrate the shots of batch_inputs: compiled fixed-step RK4 (step batch_dt), one CUDA thread per shot if
+        use_cuda, else each shot on its own core, or all shots stepped together with NumPy without numba.
+        coeffs defaults to the current [C_d0, C_d1, C_d2, C_d4, C_l2, C_l4]; a (k, 6) array runs every shot with
+        each of the k coefficient sets in the same kernel call.
+        Returns the landing x, y and the apex height in meters, arrays of shape (N,), or (k, N) for k sets.
+        """
+        if coeffs is None:
+            coeffs = [self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4]
+        sets = np.atleast_2d(np.asarray(coeffs, dtype=np.float64))
+        k, n = sets.shape[0], inputs[0].shape[0]
+        if k > 1:
+            inputs = tuple(np.tile(a, k) if isinstance(a, np.ndarray) else a for a in inputs)
+        lanes = np.repeat(sets, n, axis=0)  # Coefficients of every (set, shot) lane
+        if self.use_cuda:
+            res = cuda.device_array((k * n, 3))
+            blocks = (k * n + threads_per_block - 1) // threads_per_block
+            _run_all_cuda[blocks, threads_per_block](
+                *[cuda.to_device(a) if isinstance(a, np.ndarray) else a for a in inputs], cuda.to_device(lanes), res)
+            res = res.copy_to_host()
+        else:
+            run_all = _run_all if HAVE_NUMBA else _run_all_numpy
+            res = run_all(*inputs, lanes)
+        res = res.reshape(k, n, 3) if np.ndim(coeffs) == 2 else res
+        return res[..., 0], res[..., 1], res[..., 2]
+    
+    def simulate_parallel(self, *args, **kwargs):
+        """get_landingpos for many shots at once: run_batch(batch_inputs(*args, **kwargs))."""
+        return self.run_batch(self.batch_inputs(*args, **kwargs))
+
+    def optimize_coefficients(self, df, maxiter=100, n_samples=200, n_seeds=3, method='L-BFGS-B'):
         """
         Optimize C_d0, C_d1, C_d2, C_d4, C_l2, C_l4 to minimize MSE of carry, side, and apex differences.
         Returns optimized coefficients and statistical metrics.
+        A Latin hypercube of n_samples points covers the bounds first; L-BFGS-B is then started from the current
+        coefficients and the n_seeds best samples, and the best local minimum is kept.
+        With method='differential_evolution' a population search over the bounds (polished by L-BFGS-B) is used
+        instead, for noisy data where the multi-start local search keeps landing in different minima.
         
         Parameters:
         - df (DataFrame): DataFrame containing shot data
-        - maxiter (int): Maximum iterations for optimization
+        - maxiter (int): Maximum iterations for each L-BFGS-B run, or generations for differential_evolution
+        - n_samples (int): Latin hypercube samples of the bounds
+        - n_seeds (int): Best samples used as extra L-BFGS-B starting points
+        - method (str): 'L-BFGS-B' or 'differential_evolution'
         
         Returns:
         - coeffs (list): Optimal coefficients [C_d0, C_d1, C_d2, C_d4, C_l2, C_l4]
         - stats (dict): Statistical metrics (MSE, MAE, R² for carry, side, apex)
         """
-        def objective_function(coeffs, df, model):
+        def batch_mse(x_m, y_m, apex_height_m, actual):
+            """MSE (equal weighting for carry, side, apex) of simulated shots; rows of 2-D results separately."""
+            return (np.mean(np.square(y_m * 1.09361 - actual[0]), axis=-1)
+                    + np.mean(np.square(x_m * 1.09361 - actual[1]), axis=-1)
+                    + np.mean(np.square(apex_height_m * 1.09361 * 3 - actual[2]), axis=-1))
+        
+        def objective_function(coeffs, inputs, actual, model):
             """Compute MSE for carry, side, and apex differences."""
             model.C_d0, model.C_d1, model.C_d2, model.C_d4, model.C_l2, model.C_l4 = coeffs
-            carry_diff = []
-            side_diff = []
-            apex_diff = []
-            sim_carries = []
-            sim_laterals = []
-            sim_apexes = []
-            
-            for _, row in df.iterrows():
-                velocity_mps = row['Ball Speed (mph)'] * 0.44704
-                windspeed_mps = row['Wind Speed (mph)'] * 0.44704
-                rho = calculate_air_density(row['Temperature (F)'], row['Humidity (%)'], row['Air Pressure (psi)'])
-                
-                x_m, y_m = model.get_landingpos(
-                    velocity=velocity_mps,
-                    launch_angle_deg=row['Launch V (deg)'],
-                    horizontal_launch_angle_deg=row['Launch H (deg)'],
-                    spin_rpm=row['Spin Rate (rpm)'],
-                    spin_angle_deg=row['Spin Axis (deg)'],
-                    windspeed=windspeed_mps,
-                    windheading_deg=row['Wind Direction (deg)'],
-                    rho=rho
-                )
-                
-                sim_lateral_yd = x_m * 1.09361
-                sim_carry_yd = y_m * 1.09361
-                apex_height_m = max(model.df_simres['z'][model.df_simres['z'] >= 0])
-                sim_apex_height_ft = apex_height_m * 1.09361 * 3
-                
-                carry_diff.append(sim_carry_yd - row['Carry (yd)'])
-                side_diff.append(sim_lateral_yd - row['Lateral (yd)'])
-                apex_diff.append(sim_apex_height_ft - row['Height (ft)'])
-                sim_carries.append(sim_carry_yd)
-                sim_laterals.append(sim_lateral_yd)
-                sim_apexes.append(sim_apex_height_ft)
-            
-            # Compute MSE (equal weighting for carry, side, apex)
-            mse = np.mean(np.square(carry_diff)) + np.mean(np.square(side_diff)) + np.mean(np.square(apex_diff))
+            # All shots in one compiled, parallel batch
+            x_m, y_m, apex_height_m = model.run_batch(inputs)
+            mse = batch_mse(x_m, y_m, apex_height_m, actual)
             
             # Store simulated values for statistical metrics
-            objective_function.sim_carries = sim_carries
-            objective_function.sim_laterals = sim_laterals
-            objective_function.sim_apexes = sim_apexes
-            objective_function.carry_diff = carry_diff
-            objective_function.side_diff = side_diff
-            objective_function.apex_diff = apex_diff
+            objective_function.sim_carries = y_m * 1.09361
+            objective_function.sim_laterals = x_m * 1.09361
+            objective_function.sim_apexes = apex_height_m * 1.09361 * 3
+            objective_function.carry_diff = objective_function.sim_carries - actual[0]
+            objective_function.side_diff = objective_function.sim_laterals - actual[1]
+            objective_function.apex_diff = objective_function.sim_apexes - actual[2]
             
             return mse
+        
+        def objective_and_gradient(coeffs, inputs, actual, model, upper):
+            """
+            MSE and its forward-difference gradient. The base and the 6 perturbed coefficient sets run as one
+            batch; a step that would leave the upper bound is taken backwards instead.
+            """
+            step = np.where(coeffs + fd_step > upper, -fd_step, fd_step)
+            sets = np.vstack([coeffs, coeffs + np.diag(step)])
+            mse = batch_mse(*model.run_batch(inputs, sets), actual)
+            return mse[0], (mse[1:] - mse[0]) / step
+        
+        def population_mse(population, inputs, actual, model):
+            """MSE of every member of a (6, S) differential_evolution population, simulated as one batch."""
+            return batch_mse(*model.run_batch(inputs, population.T), actual)
 
+        # Shot inputs and measurements do not change between evaluations: convert them once
+        inputs = self.batch_inputs(**simulation_inputs(df))
+        actual = (df['Carry (yd)'].to_numpy(), df['Lateral (yd)'].to_numpy(), df['Height (ft)'].to_numpy())
+        
         # Initial guess for coefficients
         initial_guess = [self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4]
         
         # Bounds to ensure physically reasonable values
         bounds = [(0.1, 0.5), (0.1, 0.5), (0.0, 0.2), (0.0, 0.1), (0.0, 0.1), (0.0, 0.1)]
+        fd_step = 1e-6  # Gradient step, relative to coefficients of order 0.1
         
-        # Run optimization
-        result = minimize(
-            fun=objective_function,
-            x0=initial_guess,
-            args=(df, self),
-            method='L-BFGS-B',
-            bounds=bounds,
-            options={'maxiter': maxiter, 'disp': True}
-        )
+        lower, upper = np.array(bounds).T
+        if method == 'differential_evolution':
+            result = differential_evolution(
+                population_mse,
+                bounds=bounds,
+                args=(inputs, actual, self),
+                maxiter=maxiter,
+                x0=initial_guess,
+                seed=0,
+                vectorized=True,
+                updating='deferred',
+                polish=True,
+                disp=True
+            )
+        elif method == 'L-BFGS-B':
+            # Global pass: the batched objective is cheap enough to survey the whole box
+            samples = qmc.scale(qmc.LatinHypercube(d=len(bounds), rng=0).random(n_samples), lower, upper)
+            sample_mse = np.array([objective_function(coeffs, inputs, actual, self) for coeffs in samples])
+            starts = [initial_guess] + list(samples[np.argsort(sample_mse)[:n_seeds]])
+            
+            # Local refinement from each start
+            result = None
+            for x0 in starts:
+                res = minimize(
+                    fun=objective_and_gradient,
+                    x0=x0,
+                    args=(inputs, actual, self, upper),
+                    method='L-BFGS-B',
+                    jac=True,
+                    bounds=bounds,
+                    options={'maxiter': maxiter, 'disp': True}
+                )
+                if result is None or res.fun < result.fun:
+                    result = res
+        else:
+            raise ValueError(f"Unknown method '{method}'; use 'L-BFGS-B' or 'differential_evolution'")
         
-        # Update coefficients
+        # Update coefficients, re-evaluating so the stored simulation results belong to them
         self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4 = result.x
+        objective_function(result.x, inputs, actual, self)
         
         # Compute statistical metrics
-        carry_mse = mean_squared_error(df['Carry (yd)'], objective_function.sim_carries)
-        side_mse = mean_squared_error(df['Lateral (yd)'], objective_function.sim_laterals)
-        apex_mse = mean_squared_error(df['Height (ft)'], objective_function.sim_apexes)
-        carry_mae = mean_absolute_error(df['Carry (yd)'], objective_function.sim_carries)
-        side_mae = mean_absolute_error(df['Lateral (yd)'], objective_function.sim_laterals)
-        apex_mae = mean_absolute_error(df['Height (ft)'], objective_function.sim_apexes)
-        carry_r2 = r2_score(df['Carry (yd)'], objective_function.sim_carries)
-        side_r2 = r2_score(df['Lateral (yd)'], objective_function.sim_laterals)
-        apex_r2 = r2_score(df['Height (ft)'], objective_function.sim_apexes)
+        actual_carry, actual_lateral, actual_height = actual
+        carry_mse = mean_squared_error(actual_carry, objective_function.sim_carries)
+        side_mse = mean_squared_error(actual_lateral, objective_function.sim_laterals)
+        apex_mse = mean_squared_error(actual_height, objective_function.sim_apexes)
+        carry_mae = mean_absolute_error(actual_carry, objective_function.sim_carries)
+        side_mae = mean_absolute_error(actual_lateral, objective_function.sim_laterals)
+        apex_mae = mean_absolute_error(actual_height, objective_function.sim_apexes)
+        carry_r2 = r2_score(actual_carry, objective_function.sim_carries)
+        side_r2 = r2_score(actual_lateral, objective_function.sim_laterals)
+        apex_r2 = r2_score(actual_height, objective_function.sim_apexes)
         
         stats = {
             'carry_mse': carry_mse,
@@ -327,6 +683,36 @@ def calculate_air_density(T_f, RH, P_psi):
     rho = (P_pa / (R_d * T_k)) * (1 - 0.378 * (P_v / P_pa))
     return rho
 
+def simulation_inputs(df):
+    """
+    Convert the FlightScope columns of df to SI keyword arguments for golf_ballstics.batch_inputs.
+    Every conversion, including air density, runs once over whole columns.
+    """
+    return dict(
+        velocity=df['Ball Speed (mph)'].to_numpy() * 0.44704,
+        launch_angle_deg=df['Launch V (deg)'].to_numpy(),
+        horizontal_launch_angle_deg=df['Launch H (deg)'].to_numpy(),
+        spin_rpm=df['Spin Rate (rpm)'].to_numpy(),
+        spin_angle_deg=df['Spin Axis (deg)'].to_numpy(),
+        windspeed=df['Wind Speed (mph)'].to_numpy() * 0.44704,
+        windheading_deg=df['Wind Direction (deg)'].to_numpy(),
+        rho=calculate_air_density(df['Temperature (F)'].to_numpy(), df['Humidity (%)'].to_numpy(),
+                                  df['Air Pressure (psi)'].to_numpy())
+    )
+
+def warmup():
+    """
+    Compile (or, thanks to cache=True, load from __pycache__) the numba kernels by simulating one dummy shot
+    through the batch and odeint paths, so the first-call compile stays out of the fit.
+    """
+    model = golf_ballstics()
+    model.simulate_parallel(velocity=np.array([60.0]), launch_angle_deg=np.array([12.0]),
+                            horizontal_launch_angle_deg=np.array([0.0]), spin_rpm=np.array([3000.0]),
+                            spin_angle_deg=np.array([0.0]), windspeed=np.array([0.0]),
+                            windheading_deg=np.array([0.0]), rho=np.array([1.225]))  # rho per shot, as in a fit
+    model.get_landingpos(velocity=60.0, launch_angle_deg=12.0, horizontal_launch_angle_deg=0.0, spin_rpm=3000.0,
+                         spin_angle_deg=0.0, windspeed=0.0, windheading_deg=0.0)
+
 # Load Excel data
 file_path = '/Users/jacksonne/Python Projects/AI_Caddie/AI_Caddie/Data_Collection/random_flightscope_data.xlsx'
 df = pd.read_excel(file_path)
@@ -337,8 +723,7 @@ numeric_columns = [
     'Launch H (deg)', 'Wind Speed (mph)', 'Temperature (F)', 'Humidity (%)', 
     'Air Pressure (psi)', 'Carry (yd)', 'Lateral (yd)', 'Height (ft)', 'Wind Direction (deg)'
 ]
-for col in numeric_columns:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
+df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
 
 # Drop rows with NaN in required columns
 required_columns = [
@@ -348,6 +733,9 @@ required_columns = [
 ]
 df = df.dropna(subset=required_columns)
 
+# Compile the kernels before the fit
+warmup()
+
 # Initialize golf model
 golf_m = golf_ballstics()
 
@@ -1,10 +1,135 @@
+import math
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from scipy.integrate import odeint
 from scipy.optimize import minimize
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from itertools import groupby
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # The kernels below run as plain Python
+    HAVE_NUMBA = False
+    prange = range
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+@njit(cache=True)
+def _cl_table(sn):
+    """
+    np.interp(sn, *golf_ballstics.sn_Cl) written out for the fixed 5-point table, clamped at the ends.
+    Breakpoints sn = 0, 0.04, 0.1, 0.2, 0.4 with Cl = 0, 0.1, 0.16, 0.23, 0.33; keep in sync with sn_Cl.
+    """
+    if sn <= 0.04:
+        return max(sn, 0.0) * 2.5  # (0.1 - 0) / (0.04 - 0)
+    elif sn <= 0.1:
+        return 0.1 + (sn - 0.04) * 1.0  # (0.16 - 0.1) / (0.1 - 0.04)
+    elif sn <= 0.2:
+        return 0.16 + (sn - 0.1) * 0.7  # (0.23 - 0.16) / (0.2 - 0.1)
+    elif sn <= 0.4:
+        return 0.23 + (sn - 0.2) * 0.5  # (0.33 - 0.23) / (0.4 - 0.2)
+    return 0.33
+
+@njit(cache=True)
+def _accel(vx, vy, vz, omega, B, sin_a, cos_a, abs_sin_a, sin2_a, windvx, windvy, g, two_pi_r, re_per_u, Re_crit,
+           C_d0, C_d1, C_d2, C_d4, C_l2, C_l4):
+    """Acceleration (m/s^2) of a ball moving at vx, vy, vz with spin omega; shared by _rhs and _run_all."""
+    ux = vx - windvx
+    uy = vy - windvy
+    uz = vz
+    u = math.sqrt(ux * ux + uy * uy + uz * uz)
+    
+    sn = omega * two_pi_r / u
+    Re = re_per_u * u
+    Cd = C_d0 + C_d1 * sn + C_d2 / (1 + Re / Re_crit) + C_d4 * abs_sin_a
+    Cl = _cl_table(sn) * (1 + C_l2 * (Re / Re_crit)) * (1 + C_l4 * sin2_a)
+    
+    ax = -B * u * (Cd * ux - Cl * uy * sin_a)
+    ay = -B * u * (Cd * uy - Cl * (ux * sin_a - uz * cos_a))
+    az = -g - B * u * (Cd * uz - Cl * uy * cos_a)
+    return ax, ay, az
+
+@njit(cache=True)
+def _rhs(state, t, params):
+    """
+    Compiled ODE right-hand side, equivalent to golf_ballstics.model. params is the float64 array built by
+    initiate_hit: the _accel arguments after omega, all constant over the flight.
+    """
+    dstate = np.empty(7)
+    dstate[0] = state[3]
+    dstate[1] = state[4]
+    dstate[2] = state[5]
+    dstate[3], dstate[4], dstate[5] = _accel(state[3], state[4], state[5], state[6], params[0], params[1], params[2],
+                                             params[3], params[4], params[5], params[6], params[7], params[8],
+                                             params[9], params[10], params[11], params[12], params[13], params[14],
+                                             params[15], params[16])
+    dstate[6] = 0.0  # No spin decay
+    return dstate
+
+@njit(cache=True)
+def _rk4(state0, h, steps, params):
+    """
+    Fixed-step RK4 of _rhs with step h, in place of odeint. The flight is smooth and non-stiff, so the step
+    (endtime / (timesteps - 1), about 0.1 s) is well within RK4's accuracy for it. Stops at the first sample
+    below ground, so the last row lies under z = 0 unless the ball is still in the air after steps * h seconds.
+    """
+    out = np.empty((steps + 1, state0.shape[0]))
+    out[0] = state0
+    for i in range(steps):
+        t = i * h
+        s = out[i]
+        k1 = _rhs(s, t, params)
+        k2 = _rhs(s + 0.5 * h * k1, t + 0.5 * h, params)
+        k3 = _rhs(s + 0.5 * h * k2, t + 0.5 * h, params)
+        k4 = _rhs(s + h * k3, t + h, params)
+        out[i + 1] = s + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        if out[i + 1, 2] < 0:
+            return out[:i + 2]
+    return out
+
+@njit(parallel=True, cache=True)
+def _run_all(velocity, launch_angle, horizontal_launch_angle, spin, spin_angle, windvx, windvy, B, re_per_u,
+             h, steps, g, two_pi_r, Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4):
+    """
+    Fixed-step RK4 for N independent shots across all cores, the state of each kept in scalar registers.
+    Angles in radians, spin in rev/s. Returns an (N, 3) array of landing x, y and apex (m); x = y = 0 for a ball
+    still in the air after steps * h seconds.
+    """
+    n = velocity.shape[0]
+    res = np.zeros((n, 3))
+    for i in prange(n):
+        sin_a = math.sin(spin_angle[i])
+        cos_a = math.cos(spin_angle[i])
+        params = (B[i], sin_a, cos_a, abs(sin_a), sin_a * sin_a, windvx[i], windvy[i], g, two_pi_r, re_per_u[i],
+                  Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4)
+        x, y, z = 0.0, 0.0, 0.0
+        vx = velocity[i] * math.cos(launch_angle[i]) * math.sin(horizontal_launch_angle[i])
+        vy = velocity[i] * math.cos(launch_angle[i]) * math.cos(horizontal_launch_angle[i])
+        vz = velocity[i] * math.sin(launch_angle[i])
+        om = spin[i]  # Constant: no spin decay
+        apex = 0.0
+        for _ in range(steps):
+            a1x, a1y, a1z = _accel(vx, vy, vz, om, *params)
+            v2x, v2y, v2z = vx + 0.5 * h * a1x, vy + 0.5 * h * a1y, vz + 0.5 * h * a1z
+            a2x, a2y, a2z = _accel(v2x, v2y, v2z, om, *params)
+            v3x, v3y, v3z = vx + 0.5 * h * a2x, vy + 0.5 * h * a2y, vz + 0.5 * h * a2z
+            a3x, a3y, a3z = _accel(v3x, v3y, v3z, om, *params)
+            v4x, v4y, v4z = vx + h * a3x, vy + h * a3y, vz + h * a3z
+            a4x, a4y, a4z = _accel(v4x, v4y, v4z, om, *params)
+            nx = x + h / 6 * (vx + 2 * v2x + 2 * v3x + v4x)
+            ny = y + h / 6 * (vy + 2 * v2y + 2 * v3y + v4y)
+            nz = z + h / 6 * (vz + 2 * v2z + 2 * v3z + v4z)
+            vx += h / 6 * (a1x + 2 * a2x + 2 * a3x + a4x)
+            vy += h / 6 * (a1y + 2 * a2y + 2 * a3y + a4y)
+            vz += h / 6 * (a1z + 2 * a2z + 2 * a3z + a4z)
+            apex = max(apex, nz)
+            if nz < 0:
+                frac = z / (z - nz)
+                res[i, 0] = x + frac * (nx - x)
+                res[i, 1] = y + frac * (ny - y)
+                break
+            x, y, z = nx, ny, nz
+        res[i, 2] = apex
+    return res
 
 class golf_ballstics:
     """
@@ -45,19 +170,21 @@ class golf_ballstics:
         # ODE solver parameters
         self.endtime = 10   # Model ball flight for 10 sec
         self.timesteps = 100  # Initial time steps
+        self.maxtime = 40  # Flights are integrated until landing or for this long at most
         
         # Simulation results storage
-        self.simres = None
-        self.df_simres = pd.DataFrame(columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
+        self.t = None        # Sample times (s)
+        self.simres = None   # (len(t), 7) array of x, y, z, v_x, v_y, v_z, omega
         
         # Aerodynamic coefficient data
-        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]
+        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]  # Compiled into _cl_table
+        self._params = None  # Per-shot constants passed to _rhs as one array, set by initiate_hit
 
     def initiate_hit(self, velocity, launch_angle_deg, horizontal_launch_angle_deg, 
                      spin_rpm, spin_angle_deg, windspeed, windheading_deg,  
                      mass=0.0455, radius=0.0213, rho=1.225, g=9.81):
         """
-        Simulates golf ball flight and stores results in self.df_simres.
+        Simulates golf ball flight and stores results in self.t and self.simres.
         """
         self.mass = mass
         self.radius = radius
@@ -66,24 +193,32 @@ class golf_ballstics:
         self.horizontal_launch_angle_deg = horizontal_launch_angle_deg
         self.windspeed = windspeed
         self.spin = spin_rpm / 60  # Convert to rev/s
-        self.spin_angle = spin_angle_deg / 180 * np.pi
+        self.spin_angle = math.radians(spin_angle_deg)
         
         # Ball velocity vector
-        theta = launch_angle_deg / 180 * np.pi
-        psi = horizontal_launch_angle_deg / 180 * np.pi
-        self.velocity = velocity * np.array([
-            np.cos(theta) * np.sin(psi),  # x
-            np.cos(theta) * np.cos(psi),  # y
-            np.sin(theta)               # z
-        ])
+        theta = math.radians(launch_angle_deg)
+        psi = math.radians(horizontal_launch_angle_deg)
+        self.velocity = (
+            velocity * math.cos(theta) * math.sin(psi),  # x
+            velocity * math.cos(theta) * math.cos(psi),  # y
+            velocity * math.sin(theta)  # z
+        )
         
         # Wind velocity vector
-        windheading = windheading_deg / 180 * np.pi
-        self.windvelocity = windspeed * np.array([
-            np.sin(windheading),  # x
-            np.cos(windheading),  # y
-            0                     # z
-        ])
+        windheading = math.radians(windheading_deg)
+        self.windvelocity = (
+            windspeed * math.sin(windheading),  # x
+            windspeed * math.cos(windheading),  # y
+            0.0  # z
+        )
+        
+        # Everything the RHS needs that is constant over the flight; the coefficients are read here, on every
+        # hit, so values set by the optimizer take effect
+        sin_a = math.sin(self.spin_angle)
+        self._params = np.array([self.B(), sin_a, math.cos(self.spin_angle), abs(sin_a), sin_a * sin_a,
+                                 self.windvelocity[0], self.windvelocity[1], self.g, 2 * math.pi * self.radius,
+                                 self.rho * 2 * self.radius / self.mu, self.Re_crit,
+                                 self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4])
         
         self.simulate()
     
@@ -94,40 +229,19 @@ class golf_ballstics:
         Forces zero curvature for spin_axis=0 and windspeed=0.
         
         Parameters:
-        - check (bool): If True, performs sanity checks and returns an error message
+        - check (bool): If True, also returns an error message ('' if the ball landed)
         - curvature_scale_params (tuple): Parameters (a, b, p) for scaling function
         - *args, **kwargs: Passed to initiate_hit
         """
         a, b, p = curvature_scale_params
-        imax = 3
+        self.initiate_hit(*args, **kwargs)
         err = ''
-        cont = True
-        default_endtime = self.endtime
-        i = 0
-        
-        while cont:
-            self.initiate_hit(*args, **kwargs)
-            i += 1
-            err = ''
-            cont = False
-            
-            if self.df_simres['z'].iloc[-1] > 0:
-                err = 'error: ball never lands'
-                self.endtime *= 2
-                cont = True
-            elif check:
-                if len(list(groupby(self.df_simres['z'], lambda x: x >= 0))) - 1 > 1:
-                    err = 'error: ball passes through the ground multiple times'
-            
-            if i >= imax:
-                cont = False
-        
-        self.endtime = default_endtime
+        if self.simres[-1, 2] >= 0:
+            err = 'error: ball never lands'
         
         if err == '':
-            index = np.argmax(self.df_simres['z'] < 0) - 1
-            p1 = (self.df_simres['x'][index], self.df_simres['y'][index], self.df_simres['z'][index])
-            p2 = (self.df_simres['x'][index + 1], self.df_simres['y'][index + 1], self.df_simres['z'][index + 1])
+            p1 = self.simres[-2, :3]
+            p2 = self.simres[-1, :3]
             t = p1[2] / (p1[2] - p2[2])
             x = p1[0] + t * (p2[0] - p1[0])
             y = p1[1] + t * (p2[1] - p1[1])
@@ -171,40 +285,13 @@ class golf_ballstics:
         - coeffs (list): Optimal coefficients [a, b, p]
         - stats (dict): Statistical metrics (MSE, MAE, R² for curvature)
         """
-        def objective_function(coeffs, df, model):
+        def objective_function(coeffs, x_m, y_m, inputs, actual_curvatures, model):
             """Compute MSE for curvature differences."""
-            a, b, p = coeffs
-            curvature_diffs = []
-            sim_curvatures = []
-            actual_curvatures = []
-            
-            for _, row in df.iterrows():
-                velocity_mps = row['Ball Speed (mph)'] * 0.44704
-                windspeed_mps = row['Wind Speed (mph)'] * 0.44704
-                rho = calculate_air_density(row['Temperature (F)'], row['Humidity (%)'], row['Air Pressure (psi)'])
-                
-                x_m, y_m = model.get_landingpos(
-                    velocity=velocity_mps,
-                    launch_angle_deg=row['Launch V (deg)'],
-                    horizontal_launch_angle_deg=row['Launch H (deg)'],
-                    spin_rpm=row['Spin Rate (rpm)'],
-                    spin_angle_deg=row['Spin Axis (deg)'],
-                    windspeed=windspeed_mps,
-                    windheading_deg=row['Wind Direction (deg)'],
-                    rho=rho,
-                    curvature_scale_params=(a, b, p)
-                )
-                
-                sim_lateral_yd = x_m * 1.09361
-                sim_carry_yd = y_m * 1.09361
-                x_straight_actual_yd = row['Carry (yd)'] * np.tan(row['Launch H (deg)'] * np.pi / 180)
-                x_straight_sim_yd = sim_carry_yd * np.tan(row['Launch H (deg)'] * np.pi / 180)
-                actual_curvature_ft = (row['Lateral (yd)'] - x_straight_actual_yd) * 3
-                sim_curvature_ft = (sim_lateral_yd - x_straight_sim_yd) * 3
-                
-                curvature_diffs.append(sim_curvature_ft - actual_curvature_ft)
-                sim_curvatures.append(sim_curvature_ft)
-                actual_curvatures.append(actual_curvature_ft)
+            sim_lateral_yd = model.scale_curvature(x_m, y_m, inputs, tuple(coeffs)) * 1.09361
+            sim_carry_yd = y_m * 1.09361
+            x_straight_sim_yd = sim_carry_yd * np.tan(inputs[2])
+            sim_curvatures = (sim_lateral_yd - x_straight_sim_yd) * 3
+            curvature_diffs = sim_curvatures - actual_curvatures
             
             mse = np.mean(np.square(curvature_diffs))
             objective_function.sim_curvatures = sim_curvatures
@@ -213,6 +300,13 @@ class golf_ballstics:
             
             return mse
 
+        # The flights do not depend on a, b, p: simulate every shot once, in one parallel batch, and let the
+        # optimizer rescale only the curvature
+        inputs = self.batch_inputs(**simulation_inputs(df))
+        x_m, y_m, _ = self.run_batch(inputs)
+        x_straight_actual_yd = df['Carry (yd)'].to_numpy() * np.tan(inputs[2])
+        actual_curvatures = (df['Lateral (yd)'].to_numpy() - x_straight_actual_yd) * 3
+        
         # Initial guess: [a, b, p]
         initial_guess = [0.0, 0.4, 1.0]  # Start with linear scaling equivalent to previous
         
@@ -223,7 +317,7 @@ class golf_ballstics:
         result = minimize(
             fun=objective_function,
             x0=initial_guess,
-            args=(df, self),
+            args=(x_m, y_m, inputs, actual_curvatures, self),
             method='L-BFGS-B',
             bounds=bounds,
             options={'maxiter': maxiter, 'disp': True}
@@ -243,11 +337,11 @@ class golf_ballstics:
         return result.x, stats
     
     def B(self):
-        area = np.pi * self.radius**2
+        area = math.pi * self.radius**2
         return self.rho * area / (2 * self.mass)
     
     def effective_spin(self, v, omega):
-        sn = omega * 2 * np.pi * self.radius / v
+        sn = omega * 2 * math.pi * self.radius / v
         return sn
     
     def reynolds_number(self, v):
@@ -268,35 +362,74 @@ class golf_ballstics:
         return cl_adjusted
     
     def model(self, state, t):
-        x, y, z, vx, vy, vz, omega = state
-        v_ball = np.array([vx, vy, vz])
-        v_rel = v_ball - self.windvelocity
-        u = np.linalg.norm(v_rel)
-        
-        a = self.spin_angle
-        B = self.B()
-        Cl = self.Cl(u, omega)
-        Cd = self.Cd(u, omega)
-        
-        ux, uy, uz = v_rel
-        dvxdt = -B * u * (Cd * ux - Cl * uy * np.sin(a))
-        dvydt = -B * u * (Cd * uy - Cl * (ux * np.sin(a) - uz * np.cos(a)))
-        dvzdt = -self.g - B * u * (Cd * uz - Cl * uy * np.cos(a))
-        domega_dt = 0  # No spin decay
-        
-        return [vx, vy, vz, dvxdt, dvydt, dvzdt, domega_dt]
+        """ODE model with no spin decay; thin wrapper around the compiled _rhs."""
+        return _rhs(state, t, self._params)
     
     def simulate(self):
-        self.df_simres['t'] = np.linspace(0, self.endtime, self.timesteps)
-        v0 = [0, 0, 0, self.velocity[0], self.velocity[1], self.velocity[2], self.spin]
-        self.simres = odeint(self.model, v0, self.df_simres['t'])
-        self.df_simres['x'] = self.simres[:, 0]
-        self.df_simres['y'] = self.simres[:, 1]
-        self.df_simres['z'] = self.simres[:, 2]
-        self.df_simres['v_x'] = self.simres[:, 3]
-        self.df_simres['v_y'] = self.simres[:, 4]
-        self.df_simres['v_z'] = self.simres[:, 5]
-        self.df_simres['omega'] = self.simres[:, 6]
+        h = self.endtime / (self.timesteps - 1)
+        v0 = np.array([0, 0, 0, *self.velocity, self.spin])
+        self.simres = _rk4(v0, h, round(self.maxtime / h), self._params)
+        self.t = h * np.arange(len(self.simres))
+    
+    @property
+    def df_simres(self):
+        """The last trajectory as a DataFrame, built on demand for inspection and plotting."""
+        return pd.DataFrame(np.column_stack([self.t, self.simres]),
+                            columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
+    
+    def batch_inputs(self, velocity, launch_angle_deg, horizontal_launch_angle_deg,
+                     spin_rpm, spin_angle_deg, windspeed, windheading_deg,
+                     mass=0.0455, radius=0.0213, rho=1.225, g=9.81):
+        """
+        Arguments of the batch kernel for many shots, given as arrays (or scalars) with the units of initiate_hit.
+        None of them depend on the fitted parameters, so a fit builds them once and passes them to run_batch on
+        every evaluation.
+        """
+        velocity, launch_angle_deg, horizontal_launch_angle_deg, spin_rpm, spin_angle_deg, windspeed, \
+            windheading_deg, rho = np.broadcast_arrays(*[np.asarray(a, dtype=np.float64) for a in (
+                velocity, launch_angle_deg, horizontal_launch_angle_deg, spin_rpm, spin_angle_deg, windspeed,
+                windheading_deg, rho)])
+        windheading = windheading_deg / 180 * np.pi
+        h = self.endtime / (self.timesteps - 1)
+        return (np.ascontiguousarray(velocity), launch_angle_deg / 180 * np.pi,
+                horizontal_launch_angle_deg / 180 * np.pi, spin_rpm / 60, spin_angle_deg / 180 * np.pi,
+                windspeed * np.sin(windheading), windspeed * np.cos(windheading),
+                rho * np.pi * radius**2 / (2 * mass), rho * 2 * radius / self.mu,
+                h, round(self.maxtime / h), g, 2 * np.pi * radius, self.Re_crit)
+    
+    def run_batch(self, inputs):
+        """
+        Integrate batch_inputs with the current coefficients. Returns the raw (unscaled) landing x, y and the apex
+        height, all arrays in meters.
+        """
+        res = _run_all(*inputs, self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4)
+        return res[:, 0], res[:, 1], res[:, 2]
+    
+    def scale_curvature(self, x, y, inputs, curvature_scale_params=(-0.0244, 0.4565, 0.5000)):
+        """
+        get_landingpos' adaptive curvature scaling for a batch: x, y are raw landing positions (m) from run_batch
+        on inputs. Returns the adjusted x (m).
+        """
+        a, b, p = curvature_scale_params
+        horizontal_launch_angle, spin_angle, windvx, windvy = inputs[2], inputs[4], inputs[5], inputs[6]
+        y_yd = y * 1.09361
+        x_straight_yd = y_yd * np.tan(horizontal_launch_angle)
+        curvature_yd = x * 1.09361 - x_straight_yd
+        scale = np.clip(a * (np.abs(curvature_yd) ** p) + b, 0.1, 2.0)
+        straight = (np.abs(spin_angle) < 1e-6) & (np.hypot(windvx, windvy) < 1e-6)  # Zero curvature
+        x_adjusted_yd = np.where(straight, x_straight_yd, x_straight_yd + curvature_yd * scale)
+        return x_adjusted_yd / 1.09361
+    
+    def simulate_parallel(self, *args, curvature_scale_params=(-0.0244, 0.4565, 0.5000), **kwargs):
+        """
+        get_landingpos for many shots at once: arguments are arrays (or scalars) with the units of initiate_hit.
+        Each shot is integrated with compiled fixed-step RK4 (step endtime / (timesteps - 1)) on its own core,
+        then the same adaptive curvature scaling is applied to the whole batch.
+        Returns the adjusted landing x, y and the apex height, all arrays in meters.
+        """
+        inputs = self.batch_inputs(*args, **kwargs)
+        x, y, apex = self.run_batch(inputs)
+        return self.scale_curvature(x, y, inputs, curvature_scale_params), y, apex
 
 def calculate_air_density(T_f, RH, P_psi):
     """
@@ -311,6 +444,23 @@ def calculate_air_density(T_f, RH, P_psi):
     rho = (P_pa / (R_d * T_k)) * (1 - 0.378 * (P_v / P_pa))
     return rho
 
+def simulation_inputs(df):
+    """
+    Convert the FlightScope columns of df to SI keyword arguments for golf_ballstics.batch_inputs.
+    Every conversion, including air density, runs once over whole columns.
+    """
+    return dict(
+        velocity=df['Ball Speed (mph)'].to_numpy() * 0.44704,
+        launch_angle_deg=df['Launch V (deg)'].to_numpy(),
+        horizontal_launch_angle_deg=df['Launch H (deg)'].to_numpy(),
+        spin_rpm=df['Spin Rate (rpm)'].to_numpy(),
+        spin_angle_deg=df['Spin Axis (deg)'].to_numpy(),
+        windspeed=df['Wind Speed (mph)'].to_numpy() * 0.44704,
+        windheading_deg=df['Wind Direction (deg)'].to_numpy(),
+        rho=calculate_air_density(df['Temperature (F)'].to_numpy(), df['Humidity (%)'].to_numpy(),
+                                  df['Air Pressure (psi)'].to_numpy())
+    )
+
 # Load Excel data
 file_path = '/Users/jacksonne/Python Projects/AI_Caddie/AI_Caddie/Data_Collection/random_flightscope_data.xlsx'
 df = pd.read_excel(file_path)
@@ -321,8 +471,7 @@ numeric_columns = [
     'Launch H (deg)', 'Wind Speed (mph)', 'Temperature (F)', 'Humidity (%)', 
     'Air Pressure (psi)', 'Carry (yd)', 'Lateral (yd)', 'Height (ft)', 'Wind Direction (deg)'
 ]
-for col in numeric_columns:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
+df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
 
 # Drop rows with NaN in required columns
 required_columns = [
@@ -335,31 +484,23 @@ df = df.dropna(subset=required_columns)
 # Function to classify a shot
 def classify_shot(launch_h_deg, spin_axis_deg):
     """
-    Classify shot based on horizontal launch angle and spin axis.
+    Classify shots based on horizontal launch angle and spin axis; works on scalars or whole columns.
     """
-    if launch_h_deg < 0:
-        if spin_axis_deg < 0:
-            return "Pull Draw"
-        elif spin_axis_deg == 0:
-            return "Pull"
-        else:
-            return "Pull Fade"
-    elif launch_h_deg == 0:
-        if spin_axis_deg < 0:
-            return "Draw"
-        elif spin_axis_deg == 0:
-            return "Straight"
-        else:
-            return "Fade"
-    elif launch_h_deg > 0:
-        if spin_axis_deg < 0:
-            return "Push Draw"
-        elif spin_axis_deg == 0:
-            return "Push"
-        elif spin_axis_deg > 0:
-            return "Push Fade"
-    else:
-        return "Unknown"
+    launch_h_deg = np.asarray(launch_h_deg)
+    spin_axis_deg = np.asarray(spin_axis_deg)
+    conditions = [
+        (launch_h_deg < 0) & (spin_axis_deg < 0),
+        (launch_h_deg < 0) & (spin_axis_deg == 0),
+        launch_h_deg < 0,
+        (launch_h_deg == 0) & (spin_axis_deg < 0),
+        (launch_h_deg == 0) & (spin_axis_deg == 0),
+        launch_h_deg == 0,
+        (launch_h_deg > 0) & (spin_axis_deg < 0),
+        (launch_h_deg > 0) & (spin_axis_deg == 0),
+        (launch_h_deg > 0) & (spin_axis_deg > 0)
+    ]
+    labels = ["Pull Draw", "Pull", "Pull Fade", "Draw", "Straight", "Fade", "Push Draw", "Push", "Push Fade"]
+    return np.select(conditions, labels, default="Unknown")
 
 # Initialize golf model
 golf_m = golf_ballstics()
@@ -380,56 +521,18 @@ print(f"Curvature R²: {stats['curvature_r2']:.4f}")
 '''End optimizer here'''
 
 
-# Process shots with optimized scaling parameters
-df['sim_carry_yd'] = np.nan
-df['sim_lateral_yd'] = np.nan
-df['sim_apex_height_ft'] = np.nan
-df['actual_curvature_ft'] = np.nan
-df['sim_curvature_ft'] = np.nan
-
-for index, row in df.iterrows():
-    ball_speed_mph = row['Ball Speed (mph)']
-    spin_rpm = row['Spin Rate (rpm)']
-    spin_axis_deg = row['Spin Axis (deg)']
-    launch_v_deg = row['Launch V (deg)']
-    launch_h_deg = row['Launch H (deg)']
-    wind_speed_mph = row['Wind Speed (mph)']
-    wind_direction_deg = row['Wind Direction (deg)']
-    T_f = row['Temperature (F)']
-    RH = row['Humidity (%)']
-    P_psi = row['Air Pressure (psi)']
-    
-    velocity_mps = ball_speed_mph * 0.44704
-    windspeed_mps = wind_speed_mph * 0.44704
-    rho = calculate_air_density(T_f, RH, P_psi)
+# Process shots with optimized scaling parameters, all rows in one compiled batch
+x_m, y_m, apex_height_m = golf_m.simulate_parallel(**simulation_inputs(df))
+df['sim_carry_yd'] = y_m * 1.09361
+df['sim_lateral_yd'] = x_m * 1.09361
+df['sim_apex_height_ft'] = apex_height_m * 1.09361 * 3
 
-    x_m, y_m = golf_m.get_landingpos(
-        velocity=velocity_mps,
-        launch_angle_deg=launch_v_deg,
-        horizontal_launch_angle_deg=launch_h_deg,
-        spin_rpm=spin_rpm,
-        spin_angle_deg=spin_axis_deg,
-        windspeed=windspeed_mps,
-        windheading_deg=wind_direction_deg,
-        rho=rho
-    )
-    
-    sim_lateral_yd = x_m * 1.09361
-    sim_carry_yd = y_m * 1.09361
-    apex_height_m = max(golf_m.df_simres['z'][golf_m.df_simres['z'] >= 0])
-    sim_apex_height_ft = apex_height_m * 1.09361 * 3
-        
-    # Calculate curvatures
-    x_straight_actual_yd = row['Carry (yd)'] * np.tan(launch_h_deg * np.pi / 180)
-    x_straight_sim_yd = sim_carry_yd * np.tan(launch_h_deg * np.pi / 180)
-    actual_curvature_ft = (row['Lateral (yd)'] - x_straight_actual_yd) * 3
-    sim_curvature_ft = (sim_lateral_yd - x_straight_sim_yd) * 3
-    
-    df.at[index, 'sim_lateral_yd'] = sim_lateral_yd
-    df.at[index, 'sim_carry_yd'] = sim_carry_yd
-    df.at[index, 'sim_apex_height_ft'] = sim_apex_height_ft
-    df.at[index, 'actual_curvature_ft'] = actual_curvature_ft
-    df.at[index, 'sim_curvature_ft'] = sim_curvature_ft
+# Calculate curvatures
+launch_h_rad = df['Launch H (deg)'] * np.pi / 180
+x_straight_actual_yd = df['Carry (yd)'] * np.tan(launch_h_rad)
+x_straight_sim_yd = df['sim_carry_yd'] * np.tan(launch_h_rad)
+df['actual_curvature_ft'] = (df['Lateral (yd)'] - x_straight_actual_yd) * 3
+df['sim_curvature_ft'] = (df['sim_lateral_yd'] - x_straight_sim_yd) * 3
 
 # Calculate differences
 df['carry_diff'] = df['sim_carry_yd'] - df['Carry (yd)']
@@ -449,7 +552,7 @@ df['side_percent_error'] = np.where(
 )
 
 # Add Shot Classification
-df['Shot Classification'] = df.apply(lambda row: classify_shot(row['Launch H (deg)'], row['Spin Axis (deg)']), axis=1)
+df['Shot Classification'] = classify_shot(df['Launch H (deg)'].to_numpy(), df['Spin Axis (deg)'].to_numpy())
 
 # Define the output file path
 output_path = '/Users/jacksonne/Python Projects/AI_Caddie/AI_Caddie/Data_Collection/random_flightscope_data_classified.xlsx'
@@ -483,6 +586,9 @@ buttons = []
 
 for i, shot_type in enumerate(shot_types):
     type_df = df[df['Shot Classification'] == shot_type]
+    # Hover text columns (zipped arrays instead of one Series per row from iterrows)
+    ball_speed = type_df['Ball Speed (mph)'].to_numpy()
+    launch_v = type_df['Launch V (deg)'].to_numpy()
     
     sim_trace = go.Scatter(
         x=type_df['sim_lateral_yd'],
@@ -490,8 +596,9 @@ for i, shot_type in enumerate(shot_types):
         mode='markers',
         name=f'{shot_type} Simulated',
         marker=dict(color='blue', symbol='circle'),
-        hovertext=[f"Simulated<br>Ball Speed: {row['Ball Speed (mph)']} mph<br>Launch V: {row['Launch V (deg)']} deg<br>Apex: {row['sim_apex_height_ft']:.1f} ft<br>Curvature: {row['sim_curvature_ft']:.1f} ft" 
-                   for _, row in type_df.iterrows()],
+        hovertext=[f"Simulated<br>Ball Speed: {bs} mph<br>Launch V: {lv} deg<br>Apex: {ap:.1f} ft<br>Curvature: {cv:.1f} ft"
+                   for bs, lv, ap, cv in zip(ball_speed, launch_v, type_df['sim_apex_height_ft'].to_numpy(),
+                                             type_df['sim_curvature_ft'].to_numpy())],
         hoverinfo='text'
     )
     
@@ -501,16 +608,17 @@ for i, shot_type in enumerate(shot_types):
         mode='markers',
         name=f'{shot_type} Actual',
         marker=dict(color='red', symbol='x'),
-        hovertext=[f"Actual<br>Ball Speed: {row['Ball Speed (mph)']} mph<br>Launch V: {row['Launch V (deg)']} deg<br>Apex: {row['Height (ft)']:.1f} ft<br>Curvature: {row['actual_curvature_ft']:.1f} ft" 
-                   for _, row in type_df.iterrows()],
+        hovertext=[f"Actual<br>Ball Speed: {bs} mph<br>Launch V: {lv} deg<br>Apex: {ap:.1f} ft<br>Curvature: {cv:.1f} ft"
+                   for bs, lv, ap, cv in zip(ball_speed, launch_v, type_df['Height (ft)'].to_numpy(),
+                                             type_df['actual_curvature_ft'].to_numpy())],
         hoverinfo='text'
     )
     
-    x_lines = []
-    y_lines = []
-    for _, row in type_df.iterrows():
-        x_lines.extend([row['sim_lateral_yd'], row['Lateral (yd)'], None])
-        y_lines.extend([row['sim_carry_yd'], row['Carry (yd)'], None])
+    # Each error line is (simulated point, actual point, None gap), interleaved from the column arrays
+    x_lines = np.column_stack([type_df['sim_lateral_yd'].to_numpy(), type_df['Lateral (yd)'].to_numpy(),
+                               np.full(len(type_df), None)]).ravel().tolist()
+    y_lines = np.column_stack([type_df['sim_carry_yd'].to_numpy(), type_df['Carry (yd)'].to_numpy(),
+                               np.full(len(type_df), None)]).ravel().tolist()
     line_trace = go.Scatter(
         x=x_lines,
         y=y_lines,
@@ -1,10 +1,209 @@
+import math
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from scipy.integrate import odeint
 from scipy.optimize import minimize
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from itertools import groupby
+try:
+    from numba import njit, prange, cuda
+    HAVE_NUMBA = True
+except ImportError:  # The kernels below run as plain Python
+    HAVE_NUMBA = False
+    prange = range
+    cuda = None
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+@njit(cache=True)
+def _cl_table(sn):
+    """
+    np.interp(sn, *golf_ballstics.sn_Cl) written out for the fixed 5-point table, clamped at the ends.
+    Breakpoints sn = 0, 0.04, 0.1, 0.2, 0.4 with Cl = 0, 0.1, 0.16, 0.23, 0.33; keep in sync with sn_Cl.
+    """
+    if sn <= 0.04:
+        return max(sn, 0.0) * 2.5  # (0.1 - 0) / (0.04 - 0)
+    elif sn <= 0.1:
+        return 0.1 + (sn - 0.04) * 1.0  # (0.16 - 0.1) / (0.1 - 0.04)
+    elif sn <= 0.2:
+        return 0.16 + (sn - 0.1) * 0.7  # (0.23 - 0.16) / (0.2 - 0.1)
+    elif sn <= 0.4:
+        return 0.23 + (sn - 0.2) * 0.5  # (0.33 - 0.23) / (0.4 - 0.2)
+    return 0.33
+
+@njit(cache=True)
+def _accel(vx, vy, vz, omega, B, sin_a, cos_a, abs_sin_a, sin2_a, windvx, windvy, g, two_pi_r, re_per_u, Re_crit,
+           C_d0, C_d1, C_d2, C_d4, C_l2, C_l4):
+    """Acceleration (m/s^2) of a ball moving at vx, vy, vz with spin omega; shared by _rhs and _run_all."""
+    ux = vx - windvx
+    uy = vy - windvy
+    uz = vz
+    u = math.sqrt(ux * ux + uy * uy + uz * uz)
+    
+    sn = omega * two_pi_r / u
+    Re = re_per_u * u
+    Cd = C_d0 + C_d1 * sn + C_d2 / (1 + Re / Re_crit) + C_d4 * abs_sin_a
+    Cl = _cl_table(sn) * (1 + C_l2 * (Re / Re_crit)) * (1 + C_l4 * sin2_a)
+    
+    ax = -B * u * (Cd * ux - Cl * uy * sin_a)
+    ay = -B * u * (Cd * uy - Cl * (ux * sin_a - uz * cos_a))
+    az = -g - B * u * (Cd * uz - Cl * uy * cos_a)
+    return ax, ay, az
+
+@njit(cache=True)
+def _rhs(state, t, params):
+    """
+    Compiled ODE right-hand side, equivalent to golf_ballstics.model. params is the float64 array built by
+    initiate_hit: the _accel arguments after omega, all constant over the flight.
+    """
+    dstate = np.empty(7)
+    dstate[0] = state[3]
+    dstate[1] = state[4]
+    dstate[2] = state[5]
+    dstate[3], dstate[4], dstate[5] = _accel(state[3], state[4], state[5], state[6], params[0], params[1], params[2],
+                                             params[3], params[4], params[5], params[6], params[7], params[8],
+                                             params[9], params[10], params[11], params[12], params[13], params[14],
+                                             params[15], params[16])
+    dstate[6] = 0.0  # No spin decay
+    return dstate
+
+@njit(cache=True)
+def _rk4(state0, h, steps, params):
+    """
+    Fixed-step RK4 of _rhs with step h, in place of odeint. The flight is smooth and non-stiff, so the step
+    (endtime / (timesteps - 1), about 0.1 s) is well within RK4's accuracy for it. Stops at the first sample
+    below ground, so the last row lies under z = 0 unless the ball is still in the air after steps * h seconds.
+    """
+    out = np.empty((steps + 1, state0.shape[0]))
+    out[0] = state0
+    for i in range(steps):
+        t = i * h
+        s = out[i]
+        k1 = _rhs(s, t, params)
+        k2 = _rhs(s + 0.5 * h * k1, t + 0.5 * h, params)
+        k3 = _rhs(s + 0.5 * h * k2, t + 0.5 * h, params)
+        k4 = _rhs(s + h * k3, t + h, params)
+        out[i + 1] = s + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        if out[i + 1, 2] < 0:
+            return out[:i + 2]
+    return out
+
+@njit(parallel=True, cache=True)
+def _run_all(velocity, launch_angle, horizontal_launch_angle, spin, spin_angle, windvx, windvy, B, re_per_u,
+             h, steps, g, two_pi_r, Re_crit, coeffs):
+    """
+    Fixed-step RK4 for N independent shots across all cores, the state of each kept in scalar registers.
+    Angles in radians, spin in rev/s; row i of the (N, 6) coeffs holds shot i's C_d0, C_d1, C_d2, C_d4, C_l2, C_l4.
+    Returns an (N, 3) array of landing x, y and apex (m); x = y = 0 for a ball
+    still in the air after steps * h seconds.
+    """
+    n = velocity.shape[0]
+    res = np.zeros((n, 3))
+    for i in prange(n):
+        sin_a = math.sin(spin_angle[i])
+        cos_a = math.cos(spin_angle[i])
+        params = (B[i], sin_a, cos_a, abs(sin_a), sin_a * sin_a, windvx[i], windvy[i], g, two_pi_r, re_per_u[i],
+                  Re_crit, coeffs[i, 0], coeffs[i, 1], coeffs[i, 2], coeffs[i, 3], coeffs[i, 4], coeffs[i, 5])
+        x, y, z = 0.0, 0.0, 0.0
+        vx = velocity[i] * math.cos(launch_angle[i]) * math.sin(horizontal_launch_angle[i])
+        vy = velocity[i] * math.cos(launch_angle[i]) * math.cos(horizontal_launch_angle[i])
+        vz = velocity[i] * math.sin(launch_angle[i])
+        om = spin[i]  # Constant: no spin decay
+        apex = 0.0
+        for _ in range(steps):
+            a1x, a1y, a1z = _accel(vx, vy, vz, om, *params)
+            v2x, v2y, v2z = vx + 0.5 * h * a1x, vy + 0.5 * h * a1y, vz + 0.5 * h * a1z
+            a2x, a2y, a2z = _accel(v2x, v2y, v2z, om, *params)
+            v3x, v3y, v3z = vx + 0.5 * h * a2x, vy + 0.5 * h * a2y, vz + 0.5 * h * a2z
+            a3x, a3y, a3z = _accel(v3x, v3y, v3z, om, *params)
+            v4x, v4y, v4z = vx + h * a3x, vy + h * a3y, vz + h * a3z
+            a4x, a4y, a4z = _accel(v4x, v4y, v4z, om, *params)
+            nx = x + h / 6 * (vx + 2 * v2x + 2 * v3x + v4x)
+            ny = y + h / 6 * (vy + 2 * v2y + 2 * v3y + v4y)
+            nz = z + h / 6 * (vz + 2 * v2z + 2 * v3z + v4z)
+            vx += h / 6 * (a1x + 2 * a2x + 2 * a3x + a4x)
+            vy += h / 6 * (a1y + 2 * a2y + 2 * a3y + a4y)
+            vz += h / 6 * (a1z + 2 * a2z + 2 * a3z + a4z)
+            apex = max(apex, nz)
+            if nz < 0:
+                frac = z / (z - nz)
+                res[i, 0] = x + frac * (nx - x)
+                res[i, 1] = y + frac * (ny - y)
+                break
+            x, y, z = nx, ny, nz
+        res[i, 2] = apex
+    return res
+
+if HAVE_NUMBA:
+    # GPU copy of the batch kernel. The lift table is compiled from the same Python source.
+    _cl_table_dev = cuda.jit(device=True)(_cl_table.py_func)
+    
+    @cuda.jit(device=True)
+    def _accel_dev(vx, vy, vz, omega, B, sin_a, cos_a, abs_sin_a, sin2_a, windvx, windvy, g, two_pi_r, re_per_u,
+                   Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4):
+        """Device version of _accel."""
+        ux = vx - windvx
+        uy = vy - windvy
+        uz = vz
+        u = math.sqrt(ux * ux + uy * uy + uz * uz)
+        
+        sn = omega * two_pi_r / u
+        Re = re_per_u * u
+        Cd = C_d0 + C_d1 * sn + C_d2 / (1 + Re / Re_crit) + C_d4 * abs_sin_a
+        Cl = _cl_table_dev(sn) * (1 + C_l2 * (Re / Re_crit)) * (1 + C_l4 * sin2_a)
+        
+        ax = -B * u * (Cd * ux - Cl * uy * sin_a)
+        ay = -B * u * (Cd * uy - Cl * (ux * sin_a - uz * cos_a))
+        az = -g - B * u * (Cd * uz - Cl * uy * cos_a)
+        return ax, ay, az
+    
+    @cuda.jit
+    def _run_all_cuda(velocity, launch_angle, horizontal_launch_angle, spin, spin_angle, windvx, windvy, B,
+                      re_per_u, h, steps, g, two_pi_r, Re_crit, coeffs, res):
+        """_run_all with one CUDA thread per shot, writing into the device array res."""
+        i = cuda.grid(1)
+        if i >= velocity.shape[0]:
+            return
+        sin_a = math.sin(spin_angle[i])
+        cos_a = math.cos(spin_angle[i])
+        abs_sin_a, sin2_a = abs(sin_a), sin_a * sin_a
+        b, wx, wy, rpu = B[i], windvx[i], windvy[i], re_per_u[i]
+        C_d0, C_d1, C_d2, C_d4, C_l2, C_l4 = coeffs[i, 0], coeffs[i, 1], coeffs[i, 2], coeffs[i, 3], coeffs[i, 4], \
+            coeffs[i, 5]
+        x, y, z = 0.0, 0.0, 0.0
+        vx = velocity[i] * math.cos(launch_angle[i]) * math.sin(horizontal_launch_angle[i])
+        vy = velocity[i] * math.cos(launch_angle[i]) * math.cos(horizontal_launch_angle[i])
+        vz = velocity[i] * math.sin(launch_angle[i])
+        om = spin[i]  # Constant: no spin decay
+        apex = 0.0
+        land_x, land_y = 0.0, 0.0
+        for _ in range(steps):
+            a1x, a1y, a1z = _accel_dev(vx, vy, vz, om, b, sin_a, cos_a, abs_sin_a, sin2_a, wx, wy, g, two_pi_r, rpu,
+                                       Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4)
+            v2x, v2y, v2z = vx + 0.5 * h * a1x, vy + 0.5 * h * a1y, vz + 0.5 * h * a1z
+            a2x, a2y, a2z = _accel_dev(v2x, v2y, v2z, om, b, sin_a, cos_a, abs_sin_a, sin2_a, wx, wy, g, two_pi_r,
+                                       rpu, Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4)
+            v3x, v3y, v3z = vx + 0.5 * h * a2x, vy + 0.5 * h * a2y, vz + 0.5 * h * a2z
+            a3x, a3y, a3z = _accel_dev(v3x, v3y, v3z, om, b, sin_a, cos_a, abs_sin_a, sin2_a, wx, wy, g, two_pi_r,
+                                       rpu, Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4)
+            v4x, v4y, v4z = vx + h * a3x, vy + h * a3y, vz + h * a3z
+            a4x, a4y, a4z = _accel_dev(v4x, v4y, v4z, om, b, sin_a, cos_a, abs_sin_a, sin2_a, wx, wy, g, two_pi_r,
+                                       rpu, Re_crit, C_d0, C_d1, C_d2, C_d4, C_l2, C_l4)
+            nx = x + h / 6 * (vx + 2 * v2x + 2 * v3x + v4x)
+            ny = y + h / 6 * (vy + 2 * v2y + 2 * v3y + v4y)
+            nz = z + h / 6 * (vz + 2 * v2z + 2 * v3z + v4z)
+            vx += h / 6 * (a1x + 2 * a2x + 2 * a3x + a4x)
+            vy += h / 6 * (a1y + 2 * a2y + 2 * a3y + a4y)
+            vz += h / 6 * (a1z + 2 * a2z + 2 * a3z + a4z)
+            apex = max(apex, nz)
+            if nz < 0:
+                frac = z / (z - nz)
+                land_x = x + frac * (nx - x)
+                land_y = y + frac * (ny - y)
+                break
+            x, y, z = nx, ny, nz
+        res[i, 0] = land_x
+        res[i, 1] = land_y
+        res[i, 2] = apex
 
 class golf_ballstics:
     """
@@ -50,13 +249,16 @@ class golf_ballstics:
         # ODE solver parameters
         self.endtime = 10
         self.timesteps = 100
+        self.maxtime = 40  # Flights are integrated until landing or for this long at most
+        self.use_cuda = HAVE_NUMBA and cuda.is_available()  # run_batch on the GPU, one thread per shot
         
         # Simulation results storage
-        self.simres = None
-        self.df_simres = pd.DataFrame(columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
+        self.t = None        # Sample times (s)
+        self.simres = None   # (len(t), 7) array of x, y, z, v_x, v_y, v_z, omega
         
         # Aerodynamic coefficient data
-        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]
+        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]  # Compiled into _cl_table
+        self._params = None  # Per-shot constants passed to _rhs as one array, set by initiate_hit
 
     def initiate_hit(self, velocity, launch_angle_deg, horizontal_launch_angle_deg, 
                      spin_rpm, spin_angle_deg, windspeed, windheading_deg,  
@@ -68,22 +270,30 @@ class golf_ballstics:
         self.horizontal_launch_angle_deg = horizontal_launch_angle_deg
         self.windspeed = windspeed
         self.spin = spin_rpm / 60
-        self.spin_angle = spin_angle_deg / 180 * np.pi
+        self.spin_angle = math.radians(spin_angle_deg)
         
-        theta = launch_angle_deg / 180 * np.pi
-        psi = horizontal_launch_angle_deg / 180 * np.pi
-        self.velocity = velocity * np.array([
-            np.cos(theta) * np.sin(psi),
-            np.cos(theta) * np.cos(psi),
-            np.sin(theta)
-        ])
+        theta = math.radians(launch_angle_deg)
+        psi = math.radians(horizontal_launch_angle_deg)
+        self.velocity = (
+            velocity * math.cos(theta) * math.sin(psi),
+            velocity * math.cos(theta) * math.cos(psi),
+            velocity * math.sin(theta)
+        )
         
-        windheading = windheading_deg / 180 * np.pi
-        self.windvelocity = windspeed * np.array([
-            np.sin(windheading),
-            np.cos(windheading),
-            0
-        ])
+        windheading = math.radians(windheading_deg)
+        self.windvelocity = (
+            windspeed * math.sin(windheading),
+            windspeed * math.cos(windheading),
+            0.0
+        )
+        
+        # Everything the RHS needs that is constant over the flight; the coefficients are read here, on every
+        # hit, so values set by the optimizer take effect
+        sin_a = math.sin(self.spin_angle)
+        self._params = np.array([self.B(), sin_a, math.cos(self.spin_angle), abs(sin_a), sin_a * sin_a,
+                                 self.windvelocity[0], self.windvelocity[1], self.g, 2 * math.pi * self.radius,
+                                 self.rho * 2 * self.radius / self.mu, self.Re_crit,
+                                 self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4])
         
         self.simulate()
     
@@ -92,35 +302,14 @@ class golf_ballstics:
             a, b, p = self.a, self.b, self.p
         else:
             a, b, p = curvature_scale_params
-        imax = 3
+        self.initiate_hit(*args, **kwargs)
         err = ''
-        cont = True
-        default_endtime = self.endtime
-        i = 0
-        
-        while cont:
-            self.initiate_hit(*args, **kwargs)
-            i += 1
-            err = ''
-            cont = False
-            
-            if self.df_simres['z'].iloc[-1] > 0:
-                err = 'error: ball never lands'
-                self.endtime *= 2
-                cont = True
-            elif check:
-                if len(list(groupby(self.df_simres['z'], lambda x: x >= 0))) - 1 > 1:
-                    err = 'error: ball passes through the ground multiple times'
-            
-            if i >= imax:
-                cont = False
-        
-        self.endtime = default_endtime
+        if self.simres[-1, 2] >= 0:
+            err = 'error: ball never lands'
         
         if err == '':
-            index = np.argmax(self.df_simres['z'] < 0) - 1
-            p1 = (self.df_simres['x'][index], self.df_simres['y'][index], self.df_simres['z'][index])
-            p2 = (self.df_simres['x'][index + 1], self.df_simres['y'][index + 1], self.df_simres['z'][index + 1])
+            p1 = self.simres[-2, :3]
+            p2 = self.simres[-1, :3]
             t = p1[2] / (p1[2] - p2[2])
             x = p1[0] + t * (p2[0] - p1[0])
             y = p1[1] + t * (p2[1] - p1[1])
@@ -152,11 +341,11 @@ class golf_ballstics:
             setattr(self, key, value)
     
     def B(self):
-        area = np.pi * self.radius**2
+        area = math.pi * self.radius**2
         return self.rho * area / (2 * self.mass)
     
     def effective_spin(self, v, omega):
-        sn = omega * 2 * np.pi * self.radius / v
+        sn = omega * 2 * math.pi * self.radius / v
         return sn
     
     def reynolds_number(self, v):
@@ -177,34 +366,93 @@ class golf_ballstics:
         return cl_adjusted
     
     def model(self, state, t):
-        x, y, z, vx, vy, vz, omega = state
-        v_ball = np.array([vx, vy, vz])
-        v_rel = v_ball - self.windvelocity
-        u = np.linalg.norm(v_rel)
-        
-        a = self.spin_angle
-        B = self.B()
-        Cl = self.Cl(u, omega)
-        Cd = self.Cd(u, omega)
-        
-        ux, uy, uz = v_rel
-        dvxdt = -B * u * (Cd * ux - Cl * uy * np.sin(a))
-        dvydt = -B * u * (Cd * uy - Cl * (ux * np.sin(a) - uz * np.cos(a)))
-        dvzdt = -self.g - B * u * (Cd * uz - Cl * uy * np.cos(a))
-        domega_dt = 0
-        return [vx, vy, vz, dvxdt, dvydt, dvzdt, domega_dt]
+        """ODE model with no spin decay; thin wrapper around the compiled _rhs."""
+        return _rhs(state, t, self._params)
     
     def simulate(self):
-        self.df_simres['t'] = np.linspace(0, self.endtime, self.timesteps)
-        v0 = [0, 0, 0, self.velocity[0], self.velocity[1], self.velocity[2], self.spin]
-        self.simres = odeint(self.model, v0, self.df_simres['t'])
-        self.df_simres['x'] = self.simres[:, 0]
-        self.df_simres['y'] = self.simres[:, 1]
-        self.df_simres['z'] = self.simres[:, 2]
-        self.df_simres['v_x'] = self.df_simres['v_x'] = self.simres[:, 3]
-        self.df_simres['v_y'] = self.simres[:, 4]
-        self.df_simres['v_z'] = self.simres[:, 5]
-        self.df_simres['omega'] = self.simres[:, 6]
+        h = self.endtime / (self.timesteps - 1)
+        v0 = np.array([0, 0, 0, *self.velocity, self.spin])
+        self.simres = _rk4(v0, h, round(self.maxtime / h), self._params)
+        self.t = h * np.arange(len(self.simres))
+    
+    @property
+    def df_simres(self):
+        """The last trajectory as a DataFrame, built on demand for inspection and plotting."""
+        return pd.DataFrame(np.column_stack([self.t, self.simres]),
+                            columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
+    
+    def batch_inputs(self, velocity, launch_angle_deg, horizontal_launch_angle_deg,
+                     spin_rpm, spin_angle_deg, windspeed, windheading_deg,
+                     mass=0.0455, radius=0.0213, rho=1.225, g=9.81):
+        """
+        Arguments of the batch kernel for many shots, given as arrays (or scalars) with the units of initiate_hit.
+        None of them depend on the fitted parameters, so a fit builds them once and passes them to run_batch on
+        every evaluation.
+        """
+        velocity, launch_angle_deg, horizontal_launch_angle_deg, spin_rpm, spin_angle_deg, windspeed, \
+            windheading_deg, rho = np.broadcast_arrays(*[np.asarray(a, dtype=np.float64) for a in (
+                velocity, launch_angle_deg, horizontal_launch_angle_deg, spin_rpm, spin_angle_deg, windspeed,
+                windheading_deg, rho)])
+        windheading = windheading_deg / 180 * np.pi
+        h = self.endtime / (self.timesteps - 1)
+        return (np.ascontiguousarray(velocity), launch_angle_deg / 180 * np.pi,
+                horizontal_launch_angle_deg / 180 * np.pi, spin_rpm / 60, spin_angle_deg / 180 * np.pi,
+                windspeed * np.sin(windheading), windspeed * np.cos(windheading),
+                rho * np.pi * radius**2 / (2 * mass), rho * 2 * radius / self.mu,
+                h, round(self.maxtime / h), g, 2 * np.pi * radius, self.Re_crit)
+    
+    def run_batch(self, inputs, coeffs=None, threads_per_block=128):
+        """
+        Integrate batch_inputs, one CUDA thread per shot if use_cuda, else each shot on its own core.
+        coeffs defaults to the current [C_d0, C_d1, C_d2, C_d4, C_l2, C_l4]; a (k, 6) array runs every shot with
+        each of the k coefficient sets in the same kernel call.
+        Returns the raw (unscaled) landing x, y and the apex height in meters, arrays of shape (N,), or (k, N).
+        """
+        if coeffs is None:
+            coeffs = [self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4]
+        sets = np.atleast_2d(np.asarray(coeffs, dtype=np.float64))
+        k, n = sets.shape[0], inputs[0].shape[0]
+        if k > 1:
+            inputs = tuple(np.tile(a, k) if isinstance(a, np.ndarray) else a for a in inputs)
+        lanes = np.repeat(sets, n, axis=0)  # Coefficients of every (set, shot) lane
+        if self.use_cuda:
+            res = cuda.device_array((k * n, 3))
+            blocks = (k * n + threads_per_block - 1) // threads_per_block
+            _run_all_cuda[blocks, threads_per_block](
+                *[cuda.to_device(a) if isinstance(a, np.ndarray) else a for a in inputs], cuda.to_device(lanes), res)
+            res = res.copy_to_host()
+        else:
+            res = _run_all(*inputs, lanes)
+        res = res.reshape(k, n, 3) if np.ndim(coeffs) == 2 else res
+        return res[..., 0], res[..., 1], res[..., 2]
+    
+    def scale_curvature(self, x, y, inputs, curvature_scale_params=None):
+        """
+        get_landingpos' adaptive curvature scaling for a batch: x, y are raw landing positions (m) from run_batch
+        on inputs. Returns the adjusted x (m).
+        """
+        if curvature_scale_params is None:
+            curvature_scale_params = (self.a, self.b, self.p)
+        a, b, p = curvature_scale_params
+        horizontal_launch_angle, spin_angle, windvx, windvy = inputs[2], inputs[4], inputs[5], inputs[6]
+        y_yd = y * 1.09361
+        x_straight_yd = y_yd * np.tan(horizontal_launch_angle)
+        curvature_yd = x * 1.09361 - x_straight_yd
+        scale = np.clip(a * (np.abs(curvature_yd) ** p) + b, 0.1, 2.0)
+        straight = (np.abs(spin_angle) < 1e-6) & (np.hypot(windvx, windvy) < 1e-6)  # Zero curvature
+        x_adjusted_yd = np.where(straight, x_straight_yd, x_straight_yd + curvature_yd * scale)
+        return x_adjusted_yd / 1.09361
+    
+    def simulate_parallel(self, *args, curvature_scale_params=None, **kwargs):
+        """
+        get_landingpos for many shots at once: arguments are arrays (or scalars) with the units of initiate_hit.
+        Each shot is integrated with compiled fixed-step RK4 (step endtime / (timesteps - 1)) on its own core,
+        then the same adaptive curvature scaling is applied to the whole batch.
+        Returns the adjusted landing x, y and the apex height, all arrays in meters.
+        """
+        inputs = self.batch_inputs(*args, **kwargs)
+        x, y, apex = self.run_batch(inputs)
+        return self.scale_curvature(x, y, inputs, curvature_scale_params), y, apex
 
 def calculate_air_density(T_f, RH, P_psi):
     T_c = (T_f - 32) * 5 / 9
@@ -216,6 +464,23 @@ def calculate_air_density(T_f, RH, P_psi):
     rho = (P_pa / (R_d * T_k)) * (1 - 0.378 * (P_v / P_pa))
     return rho
 
+def simulation_inputs(df):
+    """
+    Convert the FlightScope columns of df to SI keyword arguments for golf_ballstics.batch_inputs.
+    Every conversion, including air density, runs once over whole columns.
+    """
+    return dict(
+        velocity=df['Ball Speed (mph)'].to_numpy() * 0.44704,
+        launch_angle_deg=df['Launch V (deg)'].to_numpy(),
+        horizontal_launch_angle_deg=df['Launch H (deg)'].to_numpy(),
+        spin_rpm=df['Spin Rate (rpm)'].to_numpy(),
+        spin_angle_deg=df['Spin Axis (deg)'].to_numpy(),
+        windspeed=df['Wind Speed (mph)'].to_numpy() * 0.44704,
+        windheading_deg=df['Wind Direction (deg)'].to_numpy(),
+        rho=calculate_air_density(df['Temperature (F)'].to_numpy(), df['Humidity (%)'].to_numpy(),
+                                  df['Air Pressure (psi)'].to_numpy())
+    )
+
 # Parameter optimization
 param_order = ['C_d0', 'C_d1', 'C_d2', 'C_d4', 'C_l4', 'a', 'b', 'p']
 initial_guess = {
@@ -242,32 +507,40 @@ bounds = {
 initial_guess_list = [initial_guess[key] for key in param_order]
 bounds_list = [bounds[key] for key in param_order]
 
-def objective_function(params_list, df, model, param_order):
+aero_order = ['C_d0', 'C_d1', 'C_d2', 'C_d4', 'C_l2', 'C_l4']  # Coefficient columns of run_batch
+curvature_order = ['a', 'b', 'p']
+
+def objective_and_gradient(params_list, inputs, actual, model, param_order, upper, fd_step=1e-8):
+    """
+    Mean squared landing error over all shots (side and carry, yd^2) and its forward-difference gradient (the step
+    L-BFGS-B uses by default). The base and every perturbed aerodynamic coefficient set run as one batch; a, b, p
+    only rescale the curvature, so their steps reuse the unperturbed flights. A step that would leave the upper
+    bound is taken backwards instead.
+    """
     model.set_params(params_list, param_order)
-    sim_x = []
-    sim_y = []
-    actual_x = []
-    actual_y = []
-    for _, row in df.iterrows():
-        velocity_mps = row['Ball Speed (mph)'] * 0.44704
-        windspeed_mps = row['Wind Speed (mph)'] * 0.44704
-        rho = calculate_air_density(row['Temperature (F)'], row['Humidity (%)'], row['Air Pressure (psi)'])
-        x_m, y_m = model.get_landingpos(
-            velocity=velocity_mps,
-            launch_angle_deg=row['Launch V (deg)'],
-            horizontal_launch_angle_deg=row['Launch H (deg)'],
-            spin_rpm=row['Spin Rate (rpm)'],
-            spin_angle_deg=row['Spin Axis (deg)'],
-            windspeed=windspeed_mps,
-            windheading_deg=row['Wind Direction (deg)'],
-            rho=rho
-        )
-        sim_x.append(x_m * 1.09361)
-        sim_y.append(y_m * 1.09361)
-        actual_x.append(row['Lateral (yd)'])
-        actual_y.append(row['Carry (yd)'])
-    mse = np.mean((np.array(sim_x) - np.array(actual_x))**2 + (np.array(sim_y) - np.array(actual_y))**2)
-    return mse
+    step = np.where(np.asarray(params_list) + fd_step > upper, -fd_step, fd_step)
+    base = np.array([getattr(model, key) for key in aero_order])
+    scale = np.array([getattr(model, key) for key in curvature_order])
+    sets = [base]
+    for key, h in zip(param_order, step):
+        if key in aero_order:
+            sets.append(base + h * (np.arange(len(aero_order)) == aero_order.index(key)))
+    x_m, y_m, _ = model.run_batch(inputs, np.array(sets))
+    
+    def mse(x, y, scale_params):
+        sim_x = model.scale_curvature(x, y, inputs, scale_params) * 1.09361
+        return np.mean((sim_x - actual[0])**2 + (y * 1.09361 - actual[1])**2, axis=-1)
+    
+    f = mse(x_m, y_m, tuple(scale))
+    grad = np.empty(len(param_order))
+    k = 1
+    for i, (key, h) in enumerate(zip(param_order, step)):
+        if key in aero_order:
+            grad[i] = (f[k] - f[0]) / h
+            k += 1
+        else:
+            grad[i] = (mse(x_m[0], y_m[0], tuple(scale + h * (np.arange(3) == curvature_order.index(key)))) - f[0]) / h
+    return f[0], grad
 
 # Load data
 file_path = '/Users/jacksonne/Python Projects/AI_Caddie/AI_Caddie/Data_Collection/random_flightscope_data.xlsx'
@@ -277,21 +550,25 @@ numeric_columns = [
     'Launch H (deg)', 'Wind Speed (mph)', 'Temperature (F)', 'Humidity (%)', 
     'Air Pressure (psi)', 'Carry (yd)', 'Lateral (yd)', 'Height (ft)', 'Wind Direction (deg)'
 ]
-for col in numeric_columns:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
+df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
 df = df.dropna(subset=numeric_columns)
 
 # Initialize model
 golf_m = golf_ballstics()
 
+# Shot inputs and measurements do not change between evaluations: convert them once
+inputs = golf_m.batch_inputs(**simulation_inputs(df))
+actual = (df['Lateral (yd)'].to_numpy(), df['Carry (yd)'].to_numpy())
+
 # Run optimization
 result = minimize(
-    fun=objective_function,
+    fun=objective_and_gradient,
     x0=initial_guess_list,
-    args=(df, golf_m, param_order),
+    args=(inputs, actual, golf_m, param_order, np.array(bounds_list)[:, 1]),
     method='L-BFGS-B',
+    jac=True,
     bounds=bounds_list,
-    options={'maxiter': 60, 'disp': True}
+    options={'maxiter': 60, 'ftol': 1e-6, 'gtol': 1e-4, 'disp': True}
 )
 
 # Optimal parameters
@@ -299,37 +576,14 @@ optimal_params_list = result.x
 optimal_params = {key: optimal_params_list[i] for i, key in enumerate(param_order)}
 golf_m.set_params(optimal_params_list, param_order)
 
-# Simulate with optimal parameters
-sim_carry = []
-sim_lateral = []
-sim_height = []
-actual_carry = []
-actual_lateral = []
-actual_height = []
-for _, row in df.iterrows():
-    velocity_mps = row['Ball Speed (mph)'] * 0.44704
-    windspeed_mps = row['Wind Speed (mph)'] * 0.44704
-    rho = calculate_air_density(row['Temperature (F)'], row['Humidity (%)'], row['Air Pressure (psi)'])
-    x_m, y_m = golf_m.get_landingpos(
-        velocity=velocity_mps,
-        launch_angle_deg=row['Launch V (deg)'],
-        horizontal_launch_angle_deg=row['Launch H (deg)'],
-        spin_rpm=row['Spin Rate (rpm)'],
-        spin_angle_deg=row['Spin Axis (deg)'],
-        windspeed=windspeed_mps,
-        windheading_deg=row['Wind Direction (deg)'],
-        rho=rho
-    )
-    sim_lateral_yd = x_m * 1.09361
-    sim_carry_yd = y_m * 1.09361
-    apex_height_m = max(golf_m.df_simres['z'][golf_m.df_simres['z'] >= 0])
-    sim_apex_height_ft = apex_height_m * 1.09361 * 3
-    sim_carry.append(sim_carry_yd)
-    sim_lateral.append(sim_lateral_yd)
-    sim_height.append(sim_apex_height_ft)
-    actual_carry.append(row['Carry (yd)'])
-    actual_lateral.append(row['Lateral (yd)'])
-    actual_height.append(row['Height (ft)'])
+# Simulate with optimal parameters, all rows in one compiled batch
+x_m, y_m, apex_height_m = golf_m.simulate_parallel(**simulation_inputs(df))
+sim_carry = y_m * 1.09361
+sim_lateral = x_m * 1.09361
+sim_height = apex_height_m * 1.09361 * 3
+actual_carry = df['Carry (yd)'].to_numpy()
+actual_lateral = df['Lateral (yd)'].to_numpy()
+actual_height = df['Height (ft)'].to_numpy()
 
 # Compute statistics
 carry_mse = mean_squared_error(actual_carry, sim_carry)
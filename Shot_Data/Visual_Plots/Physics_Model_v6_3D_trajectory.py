@@ -1,10 +1,90 @@
+import math
+from functools import lru_cache
 import dash
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, Patch
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
-from scipy.integrate import odeint
-from itertools import groupby
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # The kernels below run as plain Python
+    HAVE_NUMBA = False
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+@njit(cache=True)
+def _cl_table(sn):
+    """
+    np.interp(sn, *golf_ballstics.sn_Cl) written out for the fixed 5-point table, clamped at the ends.
+    Breakpoints sn = 0, 0.04, 0.1, 0.2, 0.4 with Cl = 0, 0.1, 0.16, 0.23, 0.33; keep in sync with sn_Cl.
+    """
+    if sn <= 0.04:
+        return max(sn, 0.0) * 2.5  # (0.1 - 0) / (0.04 - 0)
+    elif sn <= 0.1:
+        return 0.1 + (sn - 0.04) * 1.0  # (0.16 - 0.1) / (0.1 - 0.04)
+    elif sn <= 0.2:
+        return 0.16 + (sn - 0.1) * 0.7  # (0.23 - 0.16) / (0.2 - 0.1)
+    elif sn <= 0.4:
+        return 0.23 + (sn - 0.2) * 0.5  # (0.33 - 0.23) / (0.4 - 0.2)
+    return 0.33
+
+@njit(cache=True)
+def _accel(vx, vy, vz, omega, B, sin_a, cos_a, abs_sin_a, sin2_a, windvx, windvy, g, two_pi_r, re_per_u, Re_crit,
+           C_d0, C_d1, C_d2, C_d4, C_l2, C_l4):
+    """Acceleration (m/s^2) of a ball moving at vx, vy, vz with spin omega."""
+    ux = vx - windvx
+    uy = vy - windvy
+    uz = vz
+    u = math.sqrt(ux * ux + uy * uy + uz * uz)
+    
+    sn = omega * two_pi_r / u
+    Re = re_per_u * u
+    Cd = C_d0 + C_d1 * sn + C_d2 / (1 + Re / Re_crit) + C_d4 * abs_sin_a
+    Cl = _cl_table(sn) * (1 + C_l2 * (Re / Re_crit)) * (1 + C_l4 * sin2_a)
+    
+    ax = -B * u * (Cd * ux - Cl * uy * sin_a)
+    ay = -B * u * (Cd * uy - Cl * (ux * sin_a - uz * cos_a))
+    az = -g - B * u * (Cd * uz - Cl * uy * cos_a)
+    return ax, ay, az
+
+@njit(cache=True)
+def _rhs(state, t, params):
+    """
+    Compiled ODE right-hand side, equivalent to golf_ballstics.model. params is the float64 array built by
+    initiate_hit: the _accel arguments after omega, all constant over the flight.
+    """
+    dstate = np.empty(7)
+    dstate[0] = state[3]
+    dstate[1] = state[4]
+    dstate[2] = state[5]
+    dstate[3], dstate[4], dstate[5] = _accel(state[3], state[4], state[5], state[6], params[0], params[1], params[2],
+                                             params[3], params[4], params[5], params[6], params[7], params[8],
+                                             params[9], params[10], params[11], params[12], params[13], params[14],
+                                             params[15], params[16])
+    dstate[6] = 0.0  # No spin decay
+    return dstate
+
+@njit(cache=True)
+def _rk4(state0, h, steps, params):
+    """
+    Fixed-step RK4 of _rhs with step h, in place of odeint. The flight is smooth and non-stiff, so the step
+    (endtime / (timesteps - 1), about 0.1 s) is well within RK4's accuracy for it. Stops at the first sample
+    below ground, so the last row lies under z = 0 unless the ball is still in the air after steps * h seconds.
+    """
+    out = np.empty((steps + 1, state0.shape[0]))
+    out[0] = state0
+    for i in range(steps):
+        t = i * h
+        s = out[i]
+        k1 = _rhs(s, t, params)
+        k2 = _rhs(s + 0.5 * h * k1, t + 0.5 * h, params)
+        k3 = _rhs(s + 0.5 * h * k2, t + 0.5 * h, params)
+        k4 = _rhs(s + h * k3, t + h, params)
+        out[i + 1] = s + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        if out[i + 1, 2] < 0:
+            return out[:i + 2]
+    return out
 
 
 class golf_ballstics:
@@ -44,21 +124,23 @@ class golf_ballstics:
         self.windspeed = None  # Store for wind check
         
         # ODE solver parameters
-        self.endtime = 10   # Model ball flight for 10 sec
+        self.endtime = 10   # Sets the step size, endtime / (timesteps - 1)
         self.timesteps = 100  # Initial time steps
+        self.maxtime = 40  # Flights are integrated until landing or for this long at most
         
         # Simulation results storage
-        self.simres = None
-        self.df_simres = pd.DataFrame(columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
+        self.t = None        # Sample times (s)
+        self.simres = None   # (len(t), 7) array of x, y, z, v_x, v_y, v_z, omega
         
         # Aerodynamic coefficient data
-        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]
+        self.sn_Cl = [[0, 0.04, 0.1, 0.2, 0.4], [0, 0.1, 0.16, 0.23, 0.33]]  # Compiled into _cl_table
+        self._params = None  # Per-shot constants passed to _rhs as one array, set by initiate_hit
 
     def initiate_hit(self, velocity, launch_angle_deg, horizontal_launch_angle_deg, 
                      spin_rpm, spin_angle_deg, windspeed, windheading_deg,  
                      mass=0.0455, radius=0.0213, rho=1.225, g=9.81):
         """
-        Simulates golf ball flight and stores results in self.df_simres.
+        Simulates golf ball flight and stores results in self.t and self.simres.
         """
         self.mass = mass
         self.radius = radius
@@ -70,21 +152,26 @@ class golf_ballstics:
         self.spin_angle = spin_angle_deg / 180 * np.pi
         
         # Ball velocity vector
-        theta = launch_angle_deg / 180 * np.pi
-        psi = horizontal_launch_angle_deg / 180 * np.pi
-        self.velocity = velocity * np.array([
-            np.cos(theta) * np.sin(psi),  # x
-            np.cos(theta) * np.cos(psi),  # y
-            np.sin(theta)               # z
-        ])
+        theta = math.radians(launch_angle_deg)
+        psi = math.radians(horizontal_launch_angle_deg)
+        cos_theta, sin_psi, cos_psi = math.cos(theta), math.sin(psi), math.cos(psi)
+        self.velocity = (velocity * cos_theta * sin_psi,  # x
+                         velocity * cos_theta * cos_psi,  # y
+                         velocity * math.sin(theta))      # z
+        self._tan_psi = math.tan(psi)  # Straight-line lateral per unit carry, used by get_landingpos
         
         # Wind velocity vector
-        windheading = windheading_deg / 180 * np.pi
-        self.windvelocity = windspeed * np.array([
-            np.sin(windheading),  # x
-            np.cos(windheading),  # y
-            0                     # z
-        ])
+        windheading = math.radians(windheading_deg)
+        self.windvelocity = (windspeed * math.sin(windheading),  # x
+                             windspeed * math.cos(windheading),  # y
+                             0.0)                                # z
+        
+        # Everything the RHS needs that is constant over the flight
+        sin_a = math.sin(self.spin_angle)
+        self._params = np.array([self.B(), sin_a, math.cos(self.spin_angle), abs(sin_a), sin_a * sin_a,
+                                 self.windvelocity[0], self.windvelocity[1], self.g, 2 * np.pi * self.radius,
+                                 self.rho * 2 * self.radius / self.mu, self.Re_crit,
+                                 self.C_d0, self.C_d1, self.C_d2, self.C_d4, self.C_l2, self.C_l4])
         
         self.simulate()
     
@@ -95,41 +182,23 @@ class golf_ballstics:
         Forces zero curvature for spin_axis=0 and windspeed=0.
         
         Parameters:
-        - check (bool): If True, performs sanity checks and returns an error message
+        - check (bool): If True, also returns an error message ('' if the ball landed)
         - curvature_scale_params (tuple): Parameters (a, b, p) for scaling function
         Parameters last optimized on 6/29/2025 3:06 pm, R^2 = 0.9463
-        - *args, **kwargs: Passed to initiate_hit
+        - *args, **kwargs: Passed to initiate_hit; with none given, the shot already simulated is reused
         """
         a, b, p = curvature_scale_params
-        imax = 3
-        err = ''
-        cont = True
-        default_endtime = self.endtime
-        i = 0
-        
-        while cont:
+        if args or kwargs:
             self.initiate_hit(*args, **kwargs)
-            i += 1
-            err = ''
-            cont = False
-            
-            if self.df_simres['z'].iloc[-1] > 0:
-                err = 'error: ball never lands'
-                self.endtime *= 2
-                cont = True
-            elif check:
-                if len(list(groupby(self.df_simres['z'], lambda x: x >= 0))) - 1 > 1:
-                    err = 'error: ball passes through the ground multiple times'
-            
-            if i >= imax:
-                cont = False
+        err = ''
         
-        self.endtime = default_endtime
+        # The integration stops at the first sample below ground, so multiple crossings cannot occur
+        if self.simres[-1, 2] >= 0:
+            err = 'error: ball never lands'
         
         if err == '':
-            index = np.argmax(self.df_simres['z'] < 0) - 1
-            p1 = (self.df_simres['x'][index], self.df_simres['y'][index], self.df_simres['z'][index])
-            p2 = (self.df_simres['x'][index + 1], self.df_simres['y'][index + 1], self.df_simres['z'][index + 1])
+            p1 = self.simres[-2, :3]
+            p2 = self.simres[-1, :3]
             t = p1[2] / (p1[2] - p2[2])
             x = p1[0] + t * (p2[0] - p1[0])
             y = p1[1] + t * (p2[1] - p1[1])
@@ -137,8 +206,7 @@ class golf_ballstics:
             # Convert to yards for curvature calculation
             y_yd = y * 1.09361
             x_yd = x * 1.09361
-            psi = self.horizontal_launch_angle_deg * np.pi / 180
-            x_straight_yd = y_yd * np.tan(psi)
+            x_straight_yd = y_yd * self._tan_psi
             curvature_yd = x_yd - x_straight_yd
             
             # Check for zero spin axis and no wind
@@ -186,35 +254,20 @@ class golf_ballstics:
         return cl_adjusted
     
     def model(self, state, t):
-        x, y, z, vx, vy, vz, omega = state
-        v_ball = np.array([vx, vy, vz])
-        v_rel = v_ball - self.windvelocity
-        u = np.linalg.norm(v_rel)
-        
-        a = self.spin_angle
-        B = self.B()
-        Cl = self.Cl(u, omega)
-        Cd = self.Cd(u, omega)
-        
-        ux, uy, uz = v_rel
-        dvxdt = -B * u * (Cd * ux - Cl * uy * np.sin(a))
-        dvydt = -B * u * (Cd * uy - Cl * (ux * np.sin(a) - uz * np.cos(a)))
-        dvzdt = -self.g - B * u * (Cd * uz - Cl * uy * np.cos(a))
-        domega_dt = 0  # No spin decay
-        
-        return [vx, vy, vz, dvxdt, dvydt, dvzdt, domega_dt]
+        """ODE model with no spin decay; thin wrapper around the compiled _rhs."""
+        return _rhs(state, t, self._params)
     
     def simulate(self):
-        self.df_simres['t'] = np.linspace(0, self.endtime, self.timesteps)
-        v0 = [0, 0, 0, self.velocity[0], self.velocity[1], self.velocity[2], self.spin]
-        self.simres = odeint(self.model, v0, self.df_simres['t'])
-        self.df_simres['x'] = self.simres[:, 0]
-        self.df_simres['y'] = self.simres[:, 1]
-        self.df_simres['z'] = self.simres[:, 2]
-        self.df_simres['v_x'] = self.simres[:, 3]
-        self.df_simres['v_y'] = self.simres[:, 4]
-        self.df_simres['v_z'] = self.simres[:, 5]
-        self.df_simres['omega'] = self.simres[:, 6]
+        h = self.endtime / (self.timesteps - 1)
+        v0 = np.array([0, 0, 0, self.velocity[0], self.velocity[1], self.velocity[2], self.spin])
+        self.simres = _rk4(v0, h, round(self.maxtime / h), self._params)
+        self.t = h * np.arange(len(self.simres))
+    
+    @property
+    def df_simres(self):
+        """The last trajectory as a DataFrame, built on demand for inspection and plotting."""
+        return pd.DataFrame(np.column_stack([self.t, self.simres]),
+                            columns=['t', 'x', 'y', 'z', 'v_x', 'v_y', 'v_z', 'omega'])
 
 def calculate_air_density(T_f, RH, P_psi):
     """
@@ -229,6 +282,112 @@ def calculate_air_density(T_f, RH, P_psi):
     rho = (P_pa / (R_d * T_k)) * (1 - 0.378 * (P_v / P_pa))
     return rho
 
+@lru_cache(maxsize=256)
+def simulate_shot(velocity_mps, launch_angle, horizontal_launch_angle, spin_rate, spin_axis,
+                  windspeed_mps, wind_direction, rho):
+    """
+    Simulates one shot and returns (simres, x_m, y_m, err) for the trajectory plot and landing readout.
+    Memoized on the inputs so re-clicking Go with unchanged values skips the simulation; the returned
+    array is shared between calls and must not be modified.
+    """
+    golf_m = golf_ballstics()
+    shot = dict(velocity=velocity_mps, launch_angle_deg=launch_angle,
+                horizontal_launch_angle_deg=horizontal_launch_angle, spin_rpm=spin_rate,
+                spin_angle_deg=spin_axis, windspeed=windspeed_mps, windheading_deg=wind_direction, rho=rho)
+    golf_m.initiate_hit(mass=0.0455, radius=0.0213, g=9.81, **shot)
+    simres = golf_m.simres
+    x_m, y_m, err = golf_m.get_landingpos(check=True)
+    simres.flags.writeable = False
+    return simres, x_m, y_m, err
+
+
+def trajectory_figure(x_plot, y_plot, z_plot, x_m, y_m, x_range, y_range, z_range):
+    """
+    Builds the full 3D figure: tee marker, trajectory line and landing marker in the styled scene.
+    Sent once when the page loads; later clicks patch only the data and axis ranges.
+    """
+    # Create 3D line plot for trajectory
+    trace = go.Scatter3d(
+        x=x_plot,
+        y=y_plot,
+        z=z_plot,
+        mode='lines',
+        line=dict(
+            color='darkblue',
+            width=2
+        ),
+        name='Trajectory'
+    )
+    
+    # Starting point marker
+    start_trace = go.Scatter3d(
+        x=[0],
+        y=[0],
+        z=[0],
+        mode='markers',
+        marker=dict(
+            color='green',
+            size=5,
+            symbol='circle'
+        ),
+        name='Tee'
+    )
+    
+    # Landing point marker
+    landing_trace = go.Scatter3d(
+        x=[x_m],
+        y=[y_m],
+        z=[0],
+        mode='markers',
+        marker=dict(
+            color='red',
+            size=5,
+            symbol='x'
+        ),
+        name='Landing Point'
+    )
+    
+    # Define scene
+    scene = dict(
+        xaxis=dict(
+            gridcolor='rgb(255, 255, 255)',
+            zerolinecolor='rgb(255, 255, 255)',
+            showbackground=True,
+            backgroundcolor='rgb(165, 210, 247)',
+            range=x_range,
+            title='x (m)'
+        ),
+        yaxis=dict(
+            gridcolor='rgb(255, 255, 255)',
+            zerolinecolor='rgb(255, 255, 255)',
+            showbackground=True,
+            backgroundcolor='rgb(165, 210, 247)',
+            range=y_range,
+            title='y (m)'
+        ),
+        zaxis=dict(
+            gridcolor='rgb(255, 255, 255)',
+            zerolinecolor='rgb(255, 255, 255)',
+            showbackground=True,
+            backgroundcolor='#006747',
+            range=z_range,
+            title='z (m)'
+        ),
+        aspectratio=dict(x=1, y=2.5, z=1),
+        camera=dict(eye=dict(x=-2.2, y=0.2, z=0.3))
+    )
+    
+    # Create figure
+    fig = go.Figure(data=[start_trace, trace, landing_trace])
+    fig.update_layout(
+        title='Golf Ball Trajectory',
+        showlegend=False,
+        margin={'t': 50},
+        scene=scene,
+        uirevision='static'  # Keep the user's camera when later clicks patch the data
+    )
+    return fig
+
 
 # Initialize Dash app
 app = dash.Dash(__name__)
@@ -348,135 +507,38 @@ def update_trajectory(n_clicks, ball_speed, launch_angle, horizontal_launch_angl
     windspeed_mps = wind_speed * 0.44704  # mph to m/s
     rho = calculate_air_density(temperature, humidity, air_pressure)
     
-    # Initialize golf model
-    golf_m = golf_ballstics()
-    
-    # Simulate shot
-    golf_m.initiate_hit(
-        velocity=velocity_mps,
-        launch_angle_deg=launch_angle,
-        horizontal_launch_angle_deg=horizontal_launch_angle,
-        spin_rpm=spin_rate,
-        spin_angle_deg=spin_axis,
-        windspeed=windspeed_mps,
-        windheading_deg=wind_direction,
-        rho=rho,
-        mass=0.0455,
-        radius=0.0213,
-        g=9.81
-    )
-    
-    # Get simulation results
-    df = golf_m.df_simres
-    
-
-
-
-    # Filter points where z >= 0
-    df_plot = df[df['z'] >= 0]
-    
-    # Create 3D line plot for trajectory
-    trace = go.Scatter3d(
-        x=df_plot['x'],
-        y=df_plot['y'],
-        z=df_plot['z'],
-        mode='lines',
-        line=dict(
-            color='darkblue',
-            width=2
-        ),
-        name='Trajectory'
-    )
-    
-    # Starting point marker
-    start_trace = go.Scatter3d(
-        x=[0],
-        y=[0],
-        z=[0],
-        mode='markers',
-        marker=dict(
-            color='green',
-            size=5,
-            symbol='circle'
-        ),
-        name='Tee'
-    )
+    # Simulate shot and get landing position
+    simres, x_m, y_m, err = simulate_shot(velocity_mps, launch_angle, horizontal_launch_angle, spin_rate,
+                                          spin_axis, windspeed_mps, wind_direction, rho)
     
-    # Get landing position
-    x_m, y_m, err = golf_m.get_landingpos(
-        check=True,
-        velocity=velocity_mps,
-        launch_angle_deg=launch_angle,
-        horizontal_launch_angle_deg=horizontal_launch_angle,
-        spin_rpm=spin_rate,
-        spin_angle_deg=spin_axis,
-        windspeed=windspeed_mps,
-        windheading_deg=wind_direction,
-        rho=rho
-    )
-    
-    # Landing point marker
-    landing_trace = go.Scatter3d(
-        x=[x_m],
-        y=[y_m],
-        z=[0],
-        mode='markers',
-        marker=dict(
-            color='red',
-            size=5,
-            symbol='x'
-        ),
-        name='Landing Point'
-    )
+    # Get simulation results, keeping points where z >= 0
+    above = simres[simres[:, 2] >= 0]
+    x_plot, y_plot, z_plot = above[:, 0], above[:, 1], above[:, 2]
     
     # Set plot ranges
-    abs_x = max(abs(df_plot['x'].min()), abs(df_plot['x'].max()))
-    y_max = max(df_plot['y']) * 1.2
-    z_max = max(max(df_plot['z']) * 1.3,2)
+    abs_x = max(abs(x_plot.min()), abs(x_plot.max()))
+    y_max = y_plot.max() * 1.2
+    z_max = max(z_plot.max() * 1.3,2)
     
-    # Define scene
-    scene = dict(
-        xaxis=dict(
-            gridcolor='rgb(255, 255, 255)',
-            zerolinecolor='rgb(255, 255, 255)',
-            showbackground=True,
-            backgroundcolor='rgb(165, 210, 247)',
-            range=[-abs_x - 5, abs_x + 5],
-            title='x (m)'
-        ),
-        yaxis=dict(
-            gridcolor='rgb(255, 255, 255)',
-            zerolinecolor='rgb(255, 255, 255)',
-            showbackground=True,
-            backgroundcolor='rgb(165, 210, 247)',
-            range=[0, y_max],
-            title='y (m)'
-        ),
-        zaxis=dict(
-            gridcolor='rgb(255, 255, 255)',
-            zerolinecolor='rgb(255, 255, 255)',
-            showbackground=True,
-            backgroundcolor='#006747',
-            range=[0, z_max],
-            title='z (m)'
-        ),
-        aspectratio=dict(x=1, y=2.5, z=1),
-        camera=dict(eye=dict(x=-2.2, y=0.2, z=0.3))
-    )
-    
-    # Create figure
-    fig = go.Figure(data=[start_trace, trace, landing_trace])
-    fig.update_layout(
-        title='Golf Ball Trajectory',
-        showlegend=False,
-        margin={'t': 50},
-        scene=scene
-    )
+    if n_clicks:
+        # The figure is already on the page: send only the trajectory, landing point and axis ranges
+        fig = Patch()
+        fig['data'][1]['x'] = x_plot
+        fig['data'][1]['y'] = y_plot
+        fig['data'][1]['z'] = z_plot
+        fig['data'][2]['x'] = [x_m]
+        fig['data'][2]['y'] = [y_m]
+        fig['layout']['scene']['xaxis']['range'] = [-abs_x - 5, abs_x + 5]
+        fig['layout']['scene']['yaxis']['range'] = [0, y_max]
+        fig['layout']['scene']['zaxis']['range'] = [0, z_max]
+    else:
+        fig = trajectory_figure(x_plot, y_plot, z_plot, x_m, y_m,
+                                [-abs_x - 5, abs_x + 5], [0, y_max], [0, z_max])
     
     # Calculate metrics
     x_yd = x_m * 1.09361
     y_yd = y_m * 1.09361
-    max_z_m = df_plot['z'].max()
+    max_z_m = z_plot.max()
     max_z_ft = max_z_m * 1.09361 * 3
     length_yd = np.sqrt(x_yd**2 + y_yd**2)
     
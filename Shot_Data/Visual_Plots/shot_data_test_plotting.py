@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import dash
@@ -13,9 +14,31 @@ if not os.path.exists(input_file):
     print(f"Error: The file '{input_file}' does not exist.")
     exit(1)
 
+def read_excel_cached(path, sheet_name):
+    """
+    Read an Excel sheet through a Parquet copy kept next to it (<name>.<sheet>.parquet).
+    The copy is rebuilt whenever the Excel file is newer, so edits to the spreadsheet are picked up.
+    Mixed text/number columns are returned as text in both cases; coerce them with pd.to_numeric.
+    """
+    cache_path = f"{os.path.splitext(path)[0]}.{sheet_name}.parquet"
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        try:
+            return pd.read_parquet(cache_path)
+        except ImportError:  # No Parquet engine (pyarrow/fastparquet) installed: fall back to the Excel file
+            pass
+    
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].astype(str)
+    try:
+        df.to_parquet(cache_path, index=False)
+    except ImportError:
+        pass
+    return df
+
 # Read the Excel file
 try:
-    df = pd.read_excel(input_file, sheet_name='All_Data')
+    df = read_excel_cached(input_file, sheet_name='All_Data')
 except Exception as e:
     print(f"Error reading Excel file: {e}")
     exit(1)
@@ -41,6 +64,28 @@ df[side_col] = pd.to_numeric(df[side_col])
 # Create a combined tag column
 df['tag'] = df['Player'] + ' - ' + df['Club'] + ' - ' + df['Shot Type']
 
+# Row positions of every (player, shot type, club) combination, in order of first appearance,
+# so the callbacks select from a few dozen groups instead of masking the whole sheet
+group_rows = df.groupby(['Player', 'Shot Type', 'Club'], dropna=False).indices
+group_rows = dict(sorted(group_rows.items(), key=lambda item: item[1][0]))
+
+def matching_groups(player='All Players', shot_type='All Shot Types', club='All Clubs'):
+    return [key for key in group_rows
+            if (player == 'All Players' or key[0] == player)
+            and (shot_type == 'All Shot Types' or key[1] == shot_type)
+            and (club == 'All Clubs' or key[2] == club)]
+
+# Plotted columns as plain arrays, and each group's tag and hover text, so the plot callback builds no pandas objects
+carry = df[carry_col].to_numpy(dtype=np.float64)
+side = df[side_col].to_numpy(dtype=np.float64)
+height = df['Height (ft)'].to_numpy(dtype=np.float64)
+group_tag = {key: df['tag'].iat[rows[0]] for key, rows in group_rows.items()}
+group_hovertext = {
+    key: [f"{group_tag[key]}<br>Carry: {c:.0f} yd<br>Side: {s:.0f} ft<br>Height: {h:.1f} ft"
+          for c, s, h in zip(carry[rows], side[rows], height[rows])]
+    for key, rows in group_rows.items()
+}
+
 # Initialize Dash app
 app = dash.Dash(__name__)
 
@@ -82,10 +127,7 @@ app.layout = html.Div(style={'display': 'flex'}, children=[
     Input('player-dropdown', 'value')
 )
 def update_shot_type_dropdown(selected_player):
-    if selected_player == 'All Players':
-        shot_types = df['Shot Type'].unique()
-    else:
-        shot_types = df[df['Player'] == selected_player]['Shot Type'].unique()
+    shot_types = list(dict.fromkeys(key[1] for key in matching_groups(selected_player)))
     return [{'label': 'All Shot Types', 'value': 'All Shot Types'}] + \
            [{'label': shot_type, 'value': shot_type} for shot_type in shot_types]
 
@@ -95,12 +137,7 @@ def update_shot_type_dropdown(selected_player):
     [Input('player-dropdown', 'value'), Input('shot-type-dropdown', 'value')]
 )
 def update_club_dropdown(selected_player, selected_shot_type):
-    filtered_df = df
-    if selected_player != 'All Players':
-        filtered_df = filtered_df[filtered_df['Player'] == selected_player]
-    if selected_shot_type != 'All Shot Types':
-        filtered_df = filtered_df[filtered_df['Shot Type'] == selected_shot_type]
-    clubs = filtered_df['Club'].unique()
+    clubs = list(dict.fromkeys(key[2] for key in matching_groups(selected_player, selected_shot_type)))
     return [{'label': 'All Clubs', 'value': 'All Clubs'}] + \
            [{'label': club, 'value': club} for club in clubs]
 
@@ -113,34 +150,25 @@ def update_club_dropdown(selected_player, selected_shot_type):
 )
 def update_plot(selected_player, selected_shot_type, selected_club):
     # Filter data
-    filtered_df = df
-    if selected_player != 'All Players':
-        filtered_df = filtered_df[filtered_df['Player'] == selected_player]
-    if selected_shot_type != 'All Shot Types':
-        filtered_df = filtered_df[filtered_df['Shot Type'] == selected_shot_type]
-    if selected_club != 'All Clubs':
-        filtered_df = filtered_df[filtered_df['Club'] == selected_club]
+    keys = matching_groups(selected_player, selected_shot_type, selected_club)
     
-    # Create traces
+    # Create traces, one per tag
     traces = []
-    for tag in filtered_df['tag'].unique():
-        tag_df = filtered_df[filtered_df['tag'] == tag]
+    for key in keys:
+        rows = group_rows[key]
         trace = go.Scatter(
-            x=tag_df[side_col],
-            y=tag_df[carry_col],
+            x=side[rows],
+            y=carry[rows],
             mode='markers',
-            name=tag,
+            name=group_tag[key],
             marker=dict(symbol='circle', size=8, color='blue'),
-            hovertext=[
-                f"{tag}<br>Carry: {row[carry_col]:.0f} yd<br>Side: {row[side_col]:.0f} ft<br>Height: {row['Height (ft)']:.1f} ft"
-                for _, row in tag_df.iterrows()
-            ],
+            hovertext=group_hovertext[key],
             hoverinfo='text'
         )
         traces.append(trace)
     
     # Set y-axis range
-    y_max = filtered_df[carry_col].max() * 1.1 if not filtered_df.empty else 100
+    y_max = max(carry[group_rows[key]].max() for key in keys) * 1.1 if keys else 100
     
     # Create figure with conditional background
     return {
@@ -1,11 +1,12 @@
 import csv
-import random
 import math
+import numpy as np
 
 # Settings
 max_angle_deg = 7
 max_angle_rad = math.radians(max_angle_deg)
 max_distance_pct = 0.05
+shots_per_type = 10
 
 # Club type and expected carry for each shot type
 carry_distances = {
@@ -21,14 +22,20 @@ carry_distances = {
     "9 iron":   {"stock": 150, "draw": 155, "fade": 143},
 }
 
+# One entry per (club, shot type), repeated for each shot, in the same order as the table above
+clubs, shot_types, carries = zip(*[(club.lower(), shot_type.lower(), carry)
+                                   for club, shot_dict in carry_distances.items()
+                                   for shot_type, carry in shot_dict.items()])
+carry = np.repeat(np.array(carries, dtype=np.float64), shots_per_type)
+
+# Draw every shot at once: carry within +/- max_distance_pct, lateral within +/- max_angle_deg of the target line
+rng = np.random.default_rng()
+y = rng.uniform(carry * (1 - max_distance_pct), carry * (1 + max_distance_pct))
+x_max = y * math.tan(max_angle_rad)
+x = rng.uniform(-x_max, x_max)
+
 with open("golf_shots.csv", "w", newline="") as csvfile:
     writer = csv.writer(csvfile)
     writer.writerow(["x", "y", "club", "shot"])
-
-    for club, shot_dict in carry_distances.items():
-        for shot_type, carry in shot_dict.items():
-            for _ in range(10):
-                y = random.uniform(carry * (1-max_distance_pct), carry * (1+max_distance_pct))
-                x_max = y * math.tan(max_angle_rad)
-                x = random.uniform(-x_max, x_max)
-                writer.writerow([round(x, 1), round(y, 1), club.lower(), shot_type.lower()])
+    writer.writerows(zip(x.round(1).tolist(), y.round(1).tolist(),
+                         np.repeat(clubs, shots_per_type).tolist(), np.repeat(shot_types, shots_per_type).tolist()))